@@ -0,0 +1,553 @@
+import os
+import gc
+import re
+import json
+import time
+import argparse
+import threading
+import tracemalloc
+import unicodedata
+from datetime import datetime, timedelta
+from typing import List, Dict, Callable, Optional
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+import pandas as pd
+from scrapeYoutubeComment import YoutubeComment, YoutubeCommentBatch, YoutubeCommentScraper, postprocess_comments, RELATIVE_TIME_PATTERN, RELATIVE_TIME_UNIT_SECONDS, LANGUAGE_HINT_PATTERNS
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+TIMESTAMPS: List[str] = ['1 day ago', '2 weeks ago', '3 months ago', '1 year ago', '3 years ago (edited)']
+
+class DictBackedYoutubeComment:
+    
+    # The comment model as it was before __slots__, kept as the baseline
+    
+    def __init__(self, comment_text: str, time_elapsed_since_comment: str, author: str, time_of_collection: str, from_video: str, tags: str, comment_id: str) -> None:
+        self.comment_text = comment_text
+        self.time_elapsed_since_comment = time_elapsed_since_comment
+        self.author = author
+        self.time_of_collection = time_of_collection
+        self.from_video = from_video
+        self.tags = tags
+        self.comment_id = comment_id
+
+def _generate_records(number_of_comments: int):
+    
+    # Every value is a fresh string, as it would be when read from WebDriver
+    for i in range(number_of_comments):
+        yield f'comment number {i} with some text', ' '.join(TIMESTAMPS[i % len(TIMESTAMPS)].split(' ')), f'@user{i % 50000}', f'Ugx{i:020d}'
+
+def _build_dict_backed(number_of_comments: int):
+    
+    return [DictBackedYoutubeComment(c, t, a, '2023-07-01', 'Video title', 'japanese, mv', i) for c, t, a, i in _generate_records(number_of_comments)]
+
+def _build_slotted(number_of_comments: int):
+    
+    return [YoutubeComment(c, t, a, '2023-07-01', 'Video title', 'japanese, mv', i) for c, t, a, i in _generate_records(number_of_comments)]
+
+def _build_batch(number_of_comments: int):
+    
+    youtube_comment_batch = YoutubeCommentBatch('2023-07-01', 'Video title', 'japanese, mv')
+    
+    for c, t, a, i in _generate_records(number_of_comments):
+        youtube_comment_batch.append_values(c, t, a, i)
+        
+    return youtube_comment_batch
+
+def _measure_peak_memory(build: Callable, number_of_comments: int) -> float:
+    
+    gc.collect()
+    tracemalloc.start()
+    
+    result = build(number_of_comments)
+    
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    
+    del result
+    
+    return peak / (1024 * 1024)
+
+def benchmark_storage(sizes: List[int]) -> None:
+    
+    builders = [('dict-backed objects', _build_dict_backed), ('slotted objects', _build_slotted), ('columnar batch', _build_batch)]
+    
+    print(f'{"comments":>10} | {"storage":<20} | {"peak MB":>10} | {"bytes/comment":>13}')
+    
+    for number_of_comments in sizes:
+        
+        for name, build in builders:
+            
+            peak_mb = _measure_peak_memory(build, number_of_comments)
+            
+            print(f'{number_of_comments:>10} | {name:<20} | {peak_mb:>10.1f} | {peak_mb * 1024 * 1024 / number_of_comments:>13.0f}')
+
+# Comment texts and authors in several scripts for the post-processing benchmark
+POSTPROCESS_TEXTS: List[str] = ['This song is amazing', 'この曲最高', '노래 너무 좋아요', '这首歌太好听了', 'Отличная песня', 'เพลงเพราะมาก', '🔥🔥🔥']
+POSTPROCESS_AUTHORS: List[str] = ['@SomeUser', '  @ＦｕｌｌＷｉｄｔｈ ', 'Old Display Name', '@user_123']
+
+def _build_postprocess_batch(number_of_comments: int) -> YoutubeCommentBatch:
+    
+    youtube_comment_batch = YoutubeCommentBatch('2023-07-01', 'Video title', 'japanese, mv')
+    
+    for i in range(number_of_comments):
+        youtube_comment_batch.append_values(f'{POSTPROCESS_TEXTS[i % len(POSTPROCESS_TEXTS)]} {i}', TIMESTAMPS[i % len(TIMESTAMPS)], POSTPROCESS_AUTHORS[i % len(POSTPROCESS_AUTHORS)], f'Ugx{i:020d}')
+        
+    return youtube_comment_batch
+
+def _postprocess_row(youtube_comment: YoutubeComment) -> dict:
+    
+    # The per-row baseline: the same derivations with plain Python per comment
+    match = re.search(RELATIVE_TIME_PATTERN, youtube_comment.time_elapsed_since_comment)
+    estimated_date_of_comment = None
+    
+    if match:
+        end_of_collection_day = datetime.strptime(youtube_comment.time_of_collection, '%Y-%m-%d') + timedelta(days=1, microseconds=-1)
+        estimated_date_of_comment = end_of_collection_day - timedelta(seconds=int(match.group(1)) * RELATIVE_TIME_UNIT_SECONDS[match.group(2)])
+        estimated_date_of_comment = estimated_date_of_comment.replace(hour=0, minute=0, second=0, microsecond=0)
+        
+    author_handle = re.sub(r'\s+', ' ', unicodedata.normalize('NFKC', youtube_comment.author).strip()).lstrip('@').casefold()
+    language_hint = next((hint for hint, pattern in LANGUAGE_HINT_PATTERNS if re.search(pattern, youtube_comment.comment_text)), 'und')
+    
+    return {
+        'estimated_date_of_comment': estimated_date_of_comment,
+        'is_edited': '(edited)' in youtube_comment.time_elapsed_since_comment,
+        'author_handle': author_handle or None,
+        'comment_length': len(youtube_comment.comment_text),
+        'language_hint': language_hint
+    }
+
+def benchmark_postprocess(sizes: List[int]) -> None:
+    
+    print(f'{"comments":>10} | {"per row s":>10} | {"vectorized s":>12} | {"speedup":>8}')
+    
+    for number_of_comments in sizes:
+        
+        youtube_comment_batch = _build_postprocess_batch(number_of_comments)
+        
+        started = time.perf_counter()
+        per_row = pd.DataFrame([_postprocess_row(youtube_comment) for youtube_comment in youtube_comment_batch])
+        per_row_seconds = time.perf_counter() - started
+        
+        started = time.perf_counter()
+        vectorized = postprocess_comments(youtube_comment_batch.to_pandas())
+        vectorized_seconds = time.perf_counter() - started
+        
+        for column in per_row.columns:
+            
+            if not per_row[column].astype(object).equals(vectorized[column].astype(object).where(vectorized[column].notna(), None)):
+                raise AssertionError(f'Column {column} differs between the per-row and the vectorized post-processing')
+        
+        print(f'{number_of_comments:>10} | {per_row_seconds:>10.2f} | {vectorized_seconds:>12.2f} | {per_row_seconds / vectorized_seconds:>7.1f}x')
+
+# The synthetic comment population. The fixture page generates the same
+# comments in JavaScript, so both sides must stay in sync.
+FIXTURE_TEXT: str = 'Lorem ipsum dolor sit amet, consectetur adipiscing elit. '
+FIXTURE_REPLIES_PER_THREAD: int = 3
+
+def get_fixture_comment(index: int) -> Dict[str, str]:
+    
+    return {
+        'comment_id': f'c{index}',
+        'comment_text': f'Comment {index}: ' + FIXTURE_TEXT * (index % 5 + 1),
+        'time_elapsed_since_comment': TIMESTAMPS[index % len(TIMESTAMPS)],
+        'author': f'@user{index % 997}'
+    }
+
+def get_fixture_replies(index: int) -> List[Dict[str, str]]:
+    
+    if index % 7 != 0:
+        return []
+    
+    return [{
+        'comment_id': f'c{index}.r{j}',
+        'comment_text': f'Reply {j} to comment {index}',
+        'time_elapsed_since_comment': TIMESTAMPS[j % len(TIMESTAMPS)],
+        'author': f'@user{(index + j + 1) % 997}'
+    } for j in range(FIXTURE_REPLIES_PER_THREAD)]
+
+FIXTURE_PAGE = '''<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Fixture watch page</title>
+<style>
+body { margin: 0; font-family: sans-serif; }
+#player { height: 600px; background: #000; }
+ytd-comment-thread-renderer { display: block; padding: 8px; border-bottom: 1px solid #ddd; }
+ytd-comment-renderer { display: block; }
+#content-text { display: block; max-height: 36px; overflow: hidden; }
+#content-text.expanded { max-height: none; }
+ytd-comment-replies-renderer { display: block; margin-left: 40px; }
+ytd-continuation-item-renderer { display: block; height: 80px; }
+tp-yt-paper-spinner { display: inline-block; width: 24px; height: 24px; }
+</style>
+<script>var ytcfg = {set: function () {}};</script>
+<script>ytcfg.set(__YTCFG__);</script>
+<script>var ytInitialData = __INITIAL_DATA__;</script>
+</head>
+<body>
+<div id="player"></div>
+<ytd-comments id="comments">
+<div id="count"><yt-formatted-string><span>__COUNT__</span><span> Comments</span></yt-formatted-string></div>
+<div id="recycled-spacer"></div>
+<div id="contents"></div>
+</ytd-comments>
+<script>
+const config = __CONFIG__;
+const TIMESTAMPS = __TIMESTAMPS__;
+const FIXTURE_TEXT = __FIXTURE_TEXT__;
+const contents = document.getElementById('contents');
+const spacer = document.getElementById('recycled-spacer');
+let nextIndex = 0;
+let loading = false;
+let recycledHeight = 0;
+
+function element(tag, attributes, children) {
+    const node = document.createElement(tag);
+    for (const [name, value] of Object.entries(attributes || {})) {
+        node.setAttribute(name, value);
+    }
+    for (const child of children || []) {
+        node.append(child);
+    }
+    return node;
+}
+
+function commentRenderer(id, author, text, time) {
+    const content = element('yt-formatted-string', {id: 'content-text'}, [text]);
+    const more = element('tp-yt-paper-button', {id: 'more'}, [element('span', {}, ['Read more'])]);
+    more.addEventListener('click', () => content.classList.add('expanded'));
+    return element('ytd-comment-renderer', {id: 'comment'}, [
+        element('div', {id: 'header-author'}, [
+            element('a', {id: 'author-text', href: '/' + author}, [element('span', {}, [author])]),
+            element('yt-formatted-string', {class: 'published-time-text'}, [
+                element('a', {href: '/watch?v=fixture&lc=' + id}, [time])
+            ])
+        ]),
+        content,
+        more
+    ]);
+}
+
+function thread(index) {
+    const node = element('ytd-comment-thread-renderer', {}, [
+        commentRenderer('c' + index, '@user' + (index % 997), 'Comment ' + index + ': ' + FIXTURE_TEXT.repeat(index % 5 + 1), TIMESTAMPS[index % TIMESTAMPS.length])
+    ]);
+    if (index % 7 === 0) {
+        const button = element('div', {}, ['View replies']);
+        const replies = element('ytd-comment-replies-renderer', {}, [
+            element('div', {id: 'more-replies'}, [
+                element('yt-button-shape', {}, [element('button', {}, [element('yt-touch-feedback-shape', {}, [button])])])
+            ])
+        ]);
+        button.addEventListener('click', () => {
+            replies.innerHTML = '';
+            replies.append(element('ytd-continuation-item-renderer', {}, [element('tp-yt-paper-spinner', {active: ''})]));
+            setTimeout(() => {
+                replies.innerHTML = '';
+                for (let j = 0; j < config.replies_per_thread; j++) {
+                    replies.append(commentRenderer('c' + index + '.r' + j, '@user' + ((index + j + 1) % 997), 'Reply ' + j + ' to comment ' + index, TIMESTAMPS[j % TIMESTAMPS.length]));
+                }
+            }, config.latency_ms);
+        });
+        node.append(replies);
+    }
+    return node;
+}
+
+const continuation = element('ytd-continuation-item-renderer', {}, [element('tp-yt-paper-spinner', {id: 'spinner'})]);
+
+function recycle() {
+    // Like YouTube, threads far above the view are dropped from the page. A
+    // spacer keeps their height so the scroll position does not jump.
+    while (contents.children.length > config.window) {
+        const first = contents.firstElementChild;
+        recycledHeight += first.offsetHeight;
+        first.remove();
+    }
+    spacer.style.height = recycledHeight + 'px';
+}
+
+function maybeLoad() {
+    if (loading || !continuation.isConnected) {
+        return;
+    }
+    if (continuation.getBoundingClientRect().top > window.innerHeight + 200) {
+        return;
+    }
+    loading = true;
+    continuation.querySelector('#spinner').setAttribute('active', '');
+    setTimeout(() => {
+        const end = Math.min(config.population, nextIndex + config.page_size);
+        for (; nextIndex < end; nextIndex++) {
+            contents.append(thread(nextIndex));
+        }
+        recycle();
+        continuation.querySelector('#spinner').removeAttribute('active');
+        if (nextIndex < config.population) {
+            contents.after(continuation);
+        } else {
+            continuation.remove();
+        }
+        loading = false;
+    }, config.latency_ms);
+}
+
+contents.after(continuation);
+window.addEventListener('scroll', maybeLoad);
+setInterval(maybeLoad, 100);
+</script>
+</body>
+</html>
+'''
+
+class FixtureWatchPageServer:
+    
+    # Serves a synthetic watch page whose comment list is appended lazily on
+    # scroll and recycles old threads, plus recorded-style InnerTube JSON
+    # responses for the same comments, on 127.0.0.1.
+    
+    def __init__(self, population: int = 2000, latency_ms: int = 300, page_size: int = 20, window: int = 400) -> None:
+        
+        self.population = population
+        self.latency_ms = latency_ms
+        self.page_size = page_size
+        self.window = window
+        self._server: Optional[ThreadingHTTPServer] = None
+        
+    def __enter__(self) -> 'FixtureWatchPageServer':
+        
+        fixture = self
+        
+        class FixtureRequestHandler(BaseHTTPRequestHandler):
+            
+            def log_message(self, *args) -> None:
+                pass
+            
+            def do_GET(self) -> None:
+                
+                self._send(200, 'text/html; charset=utf-8', fixture.get_watch_page().encode('utf-8'))
+                
+            def do_POST(self) -> None:
+                
+                request_data = json.loads(self.rfile.read(int(self.headers['Content-Length'])))
+                
+                time.sleep(fixture.latency_ms / 1000)
+                
+                self._send(200, 'application/json', json.dumps(fixture.get_continuation_response(request_data['continuation'])).encode('utf-8'))
+                
+            def _send(self, status: int, content_type: str, body: bytes) -> None:
+                
+                self.send_response(status)
+                self.send_header('Content-Type', content_type)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+        
+        self._server = ThreadingHTTPServer(('127.0.0.1', 0), FixtureRequestHandler)
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        
+        return self
+    
+    def __exit__(self, *args) -> None:
+        
+        self._server.shutdown()
+        self._server.server_close()
+        
+    @property
+    def video_url(self) -> str:
+        
+        return f'http://127.0.0.1:{self._server.server_port}/watch?v=fixture'
+    
+    def get_expected_comment_ids(self, include_replies: bool) -> set:
+        
+        expected_comment_ids = set()
+        
+        for i in range(self.population):
+            
+            expected_comment_ids.add(f'c{i}')
+            
+            if include_replies:
+                expected_comment_ids.update(r['comment_id'] for r in get_fixture_replies(i))
+                
+        return expected_comment_ids
+        
+    def get_watch_page(self) -> str:
+        
+        ytcfg = {'INNERTUBE_API_KEY': 'fixture', 'INNERTUBE_CONTEXT': {'client': {'clientName': 'WEB', 'clientVersion': '2.20230701'}}}
+        initial_data = {'contents': {'twoColumnWatchNextResults': {'results': {'results': {'contents': [{'itemSectionRenderer': {
+            'sectionIdentifier': 'comment-item-section',
+            'contents': [self._get_continuation_item('page:0')]
+        }}]}}}}}
+        config = {'population': self.population, 'latency_ms': self.latency_ms, 'page_size': self.page_size, 'window': self.window, 'replies_per_thread': FIXTURE_REPLIES_PER_THREAD}
+        
+        return (FIXTURE_PAGE
+                .replace('__YTCFG__', json.dumps(ytcfg))
+                .replace('__INITIAL_DATA__', json.dumps(initial_data))
+                .replace('__COUNT__', f'{self.population:,}')
+                .replace('__CONFIG__', json.dumps(config))
+                .replace('__TIMESTAMPS__', json.dumps(TIMESTAMPS))
+                .replace('__FIXTURE_TEXT__', json.dumps(FIXTURE_TEXT)))
+    
+    def get_continuation_response(self, continuation_token: str) -> dict:
+        
+        kind, value = continuation_token.split(':')
+        continuation_items: List[dict] = []
+        
+        if kind == 'page':
+            
+            page: int = int(value)
+            start: int = page * self.page_size
+            end: int = min(self.population, start + self.page_size)
+            
+            if page == 0:
+                continuation_items.append({'commentsHeaderRenderer': {'countText': {'runs': [{'text': f'{self.population:,}'}, {'text': ' Comments'}]}}})
+            
+            for i in range(start, end):
+                
+                comment_thread = {'comment': {'commentRenderer': self._get_comment_renderer(get_fixture_comment(i))}}
+                
+                if get_fixture_replies(i):
+                    comment_thread['replies'] = {'commentRepliesRenderer': {'contents': [self._get_continuation_item(f'replies:{i}')]}}
+                    
+                continuation_items.append({'commentThreadRenderer': comment_thread})
+                
+            if end < self.population:
+                continuation_items.append(self._get_continuation_item(f'page:{page + 1}'))
+                
+        else:
+            
+            continuation_items.extend({'commentRenderer': self._get_comment_renderer(r)} for r in get_fixture_replies(int(value)))
+        
+        return {'onResponseReceivedEndpoints': [{'appendContinuationItemsAction': {'continuationItems': continuation_items}}]}
+    
+    def _get_comment_renderer(self, comment_record: Dict[str, str]) -> dict:
+        
+        return {
+            'commentId': comment_record['comment_id'],
+            'contentText': {'runs': [{'text': comment_record['comment_text']}]},
+            'publishedTimeText': {'runs': [{'text': comment_record['time_elapsed_since_comment']}]},
+            'authorText': {'simpleText': comment_record['author']}
+        }
+    
+    def _get_continuation_item(self, continuation_token: str) -> dict:
+        
+        return {'continuationItemRenderer': {'continuationEndpoint': {'continuationCommand': {'token': continuation_token}}}}
+
+def _watch_peak_browser_memory(stop_event: threading.Event, peak: Dict[str, float]) -> None:
+    
+    this_process = psutil.Process(os.getpid())
+    
+    while not stop_event.wait(0.5):
+        
+        memory_used_mb: float = 0
+        
+        for child in this_process.children(recursive=True):
+            
+            try:
+                memory_used_mb += child.memory_info().rss / (1024 * 1024)
+            except psutil.Error:
+                pass
+            
+        peak['browser_mb'] = max(peak['browser_mb'], memory_used_mb)
+
+def run_scrape_method(edge_driver_path: str, browser: str, fixture: FixtureWatchPageServer, scrape_method: str, number_of_comments_to_scrape: int, scrape_replies: bool) -> dict:
+    
+    youtube_comment_scraper = YoutubeCommentScraper(edge_driver_path, 'fixture', fixture.video_url, headless=True, browser=browser)
+    
+    peak = {'browser_mb': 0.0}
+    stop_event = threading.Event()
+    
+    if psutil is not None:
+        threading.Thread(target=_watch_peak_browser_memory, args=(stop_event, peak), daemon=True).start()
+    
+    gc.collect()
+    tracemalloc.start()
+    started: float = time.monotonic()
+    
+    try:
+        youtube_comment_scraper.scrape_comments(number_of_comments_to_scrape=number_of_comments_to_scrape, scrape_method=scrape_method, scrape_replies=scrape_replies)
+    finally:
+        
+        elapsed: float = time.monotonic() - started
+        _, peak_python_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        stop_event.set()
+    
+    comment_ids = [c.comment_id for c in youtube_comment_scraper.scraped_youtube_comments]
+    unique_comment_ids = set(comment_ids)
+    # The stored comments are deduplicated already, the duplicates are
+    # counted on extraction
+    counters = youtube_comment_scraper.metrics.counters
+    expected_comment_ids = fixture.get_expected_comment_ids(scrape_replies)
+    
+    return {
+        'scrape_method': scrape_method,
+        'comments': len(comment_ids),
+        'seconds': round(elapsed, 2),
+        'comments_per_second': round(len(unique_comment_ids) / elapsed, 2) if elapsed > 0 else None,
+        'recall': round(len(unique_comment_ids & expected_comment_ids) / min(number_of_comments_to_scrape, len(expected_comment_ids)), 4),
+        'duplicate_rate': round(counters.get('duplicates', 0) / counters['comments_extracted'], 4) if counters.get('comments_extracted') else 0.0,
+        'unknown_comments': len(unique_comment_ids - expected_comment_ids),
+        'peak_python_mb': round(peak_python_memory / (1024 * 1024), 1),
+        'peak_browser_mb': round(peak['browser_mb'], 1) if psutil is not None else None
+    }
+
+def benchmark_methods(edge_driver_path: str, browser: str, scrape_methods: List[str], population: int, latency_ms: int, page_size: int, window: int, number_of_comments_to_scrape: int, scrape_replies: bool, output_path: Optional[str]) -> List[dict]:
+    
+    results: List[dict] = []
+    
+    for scrape_method in scrape_methods:
+        
+        # A fresh server per method, so no method benefits from another's warm state
+        with FixtureWatchPageServer(population, latency_ms, page_size, window) as fixture:
+            results.append(run_scrape_method(edge_driver_path, browser, fixture, scrape_method, number_of_comments_to_scrape, scrape_replies))
+            
+        result = results[-1]
+        
+        print(f'{result["scrape_method"]:<10} | {result["comments"]:>8} comments | {result["seconds"]:>8.1f}s | {result["comments_per_second"]:>8} c/s | recall {result["recall"]:.1%} | duplicates {result["duplicate_rate"]:.1%} | python {result["peak_python_mb"]} MB | browser {result["peak_browser_mb"]} MB')
+        
+    if output_path is not None:
+        
+        with open(output_path, 'w', encoding='utf-8') as output_file:
+            json.dump({'population': population, 'latency_ms': latency_ms, 'page_size': page_size, 'window': window, 'number_of_comments_to_scrape': number_of_comments_to_scrape, 'scrape_replies': scrape_replies, 'results': results}, output_file, indent=2)
+            
+    return results
+
+def main():
+    
+    parser = argparse.ArgumentParser(description='Benchmarks for the YouTube comment scraper')
+    subparsers = parser.add_subparsers(dest='benchmark', required=True)
+    
+    storage_parser = subparsers.add_parser('storage', help='peak memory of the comment storage models')
+    storage_parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    
+    postprocess_parser = subparsers.add_parser('postprocess', help='vectorized post-processing against a per-row baseline')
+    postprocess_parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    
+    methods_parser = subparsers.add_parser('methods', help='scrape methods against a local fixture watch page')
+    methods_parser.add_argument('--edge-driver-path', default=r'C:\Program Files\drivers\msedgedriver_114.exe')
+    methods_parser.add_argument('--browser', choices=['edge', 'chrome'], default='edge')
+    methods_parser.add_argument('--scrape-methods', nargs='+', default=['simple', 'batched', 'expensive', 'streaming', 'innertube'])
+    methods_parser.add_argument('--population', type=int, default=2000)
+    methods_parser.add_argument('--latency-ms', type=int, default=300)
+    methods_parser.add_argument('--page-size', type=int, default=20)
+    methods_parser.add_argument('--window', type=int, default=400, help='rendered threads kept before old ones are recycled')
+    methods_parser.add_argument('--number-of-comments-to-scrape', type=int, default=1000)
+    methods_parser.add_argument('--scrape-replies', action='store_true')
+    methods_parser.add_argument('--output', help='write the results as JSON to this path')
+    
+    arguments = parser.parse_args()
+    
+    if arguments.benchmark == 'storage':
+        benchmark_storage(arguments.sizes)
+    elif arguments.benchmark == 'postprocess':
+        benchmark_postprocess(arguments.sizes)
+    elif arguments.benchmark == 'methods':
+        benchmark_methods(arguments.edge_driver_path, arguments.browser, arguments.scrape_methods, arguments.population, arguments.latency_ms, arguments.page_size, arguments.window, arguments.number_of_comments_to_scrape, arguments.scrape_replies, arguments.output)
+
+if __name__ == "__main__":
+    main()
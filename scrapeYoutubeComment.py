@@ -1,397 +1,3399 @@
 
 import os
+import math
+import re
+import csv
+import json
 import logging
+import hashlib
+import sqlite3
+import requests
+import numpy as np
 import pandas as pd
-from typing import Optional, List, Tuple
-from datetime import date
+from abc import ABC, abstractmethod
+from typing import Optional, List, Dict, Tuple, Callable
+from contextlib import contextmanager
+from datetime import date, datetime
 import time
-from selenium.webdriver import Edge
+import queue
+import asyncio
+import functools
+import threading
+import multiprocessing.util
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, Future, wait, FIRST_COMPLETED
+from urllib.parse import urlparse
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from selenium.webdriver import Edge, EdgeOptions, Chrome, ChromeOptions
+from selenium.webdriver.remote.webdriver import WebDriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.common.keys import Keys
+from selenium.webdriver.remote.webelement import WebElement
+from selenium.common.exceptions import TimeoutException, StaleElementReferenceException
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+    
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = None
+    pq = None
+
+# Reads every rendered comment (and reply) inside the comment threads in one
+# round trip, so no WebElement ever leaves the page and recycled nodes cannot
+# go stale between collection and text access. With arguments[0] set, threads
+# already harvested are skipped and newly read ones are marked.
+COMMENT_RECORDS_SCRIPT = '''
+const onlyNew = arguments[0];
+const records = [];
+for (const thread of document.querySelectorAll('ytd-comment-thread-renderer')) {
+    if (onlyNew) {
+        if (thread.hasAttribute('data-harvested')) {
+            continue;
+        }
+        thread.setAttribute('data-harvested', '');
+    }
+    for (const comment of thread.querySelectorAll('ytd-comment-renderer, ytd-comment-view-model')) {
+        const text = comment.querySelector('#content-text');
+        if (!text) {
+            continue;
+        }
+        const time = comment.querySelector('#published-time-text a, #header-author yt-formatted-string a');
+        const author = comment.querySelector('#author-text');
+        const href = time ? (time.getAttribute('href') || '') : '';
+        const match = href.match(/[?&]lc=([^&#]+)/);
+        records.push({
+            comment_id: match ? match[1] : '',
+            comment_text: text.innerText,
+            time_elapsed_since_comment: time ? time.innerText.trim() : '',
+            author: author ? author.innerText.trim() : ''
+        });
+    }
+}
+return records;
+'''
+
+# Clicks every button matched by a CSS selector or XPath in one call, then
+# waits inside the page until no reply continuation is loading (or the settle
+# timeout passes) and reports what was clicked, what failed and what is still
+# pending.
+CLICK_ALL_SCRIPT = '''
+const [locator, isXPath, settleTimeoutMs] = arguments;
+const done = arguments[arguments.length - 1];
+let targets = [];
+if (isXPath) {
+    const result = document.evaluate(locator, document, null, XPathResult.ORDERED_NODE_SNAPSHOT_TYPE, null);
+    for (let i = 0; i < result.snapshotLength; i++) {
+        targets.push(result.snapshotItem(i));
+    }
+} else {
+    targets = Array.from(document.querySelectorAll(locator));
+}
+let clicked = 0;
+let failed = 0;
+for (const target of targets) {
+    try {
+        target.click();
+        clicked++;
+    } catch (e) {
+        failed++;
+    }
+}
+const countPending = () => document.querySelectorAll(
+    'ytd-comment-replies-renderer tp-yt-paper-spinner[active], ytd-comment-replies-renderer #spinner[active]'
+).length;
+const started = Date.now();
+let quietPolls = 0;
+const poll = () => {
+    const pending = countPending();
+    quietPolls = pending === 0 ? quietPolls + 1 : 0;
+    if (clicked === 0 || quietPolls >= 3 || Date.now() - started >= settleTimeoutMs) {
+        done({clicked: clicked, failed: failed, pending: pending});
+    } else {
+        setTimeout(poll, 100);
+    }
+};
+poll();
+'''
+
+# Upper bound, in seconds, for reply continuations to settle after a bulk click.
+REPLIES_SETTLE_TIMEOUT: float = 20
+
+# Names of the scroll keys in the AdaptivePacer report
+SCROLL_KEY_NAMES: Dict[str, str] = {Keys.PAGE_DOWN: 'page down', Keys.PAGE_UP: 'page up', Keys.END: 'end', Keys.HOME: 'home'}
+
+# Snapshot used by AdaptivePacer to tell whether a scroll has finished loading:
+# page height, number of rendered comment threads and whether the comment
+# continuation spinner is still inside the viewport (a continuation is pending).
+PAGE_LOAD_STATE_SCRIPT = '''
+const spinner = document.querySelector('ytd-comments ytd-continuation-item-renderer #spinner, ytd-comments ytd-continuation-item-renderer tp-yt-paper-spinner');
+let spinnerVisible = false;
+if (spinner && spinner.offsetParent !== null) {
+    const rect = spinner.getBoundingClientRect();
+    spinnerVisible = rect.bottom > 0 && rect.top < window.innerHeight;
+}
+return [
+    document.documentElement.scrollHeight,
+    document.querySelectorAll('ytd-comment-thread-renderer').length,
+    spinnerVisible
+];
+'''
+
+# Removes harvested comment threads (with their reply subtrees) from the page,
+# except the last arguments[0] of them, and grows a spacer by the removed height
+# so the scroll position and scrollHeight stay where they were. The comment
+# continuation element is never touched. Returns what was removed along with
+# the JS heap size and DOM node count afterwards.
+TRIM_PAGE_MEMORY_SCRIPT = '''
+const keepThreads = arguments[0];
+const harvested = document.querySelectorAll('ytd-comment-thread-renderer[data-harvested]');
+const numberToRemove = Math.max(0, harvested.length - keepThreads);
+let removedHeight = 0;
+if (numberToRemove > 0) {
+    const container = harvested[0].parentNode;
+    for (let i = 0; i < numberToRemove; i++) {
+        const thread = harvested[i];
+        removedHeight += thread.getBoundingClientRect().height;
+        try {
+            thread.data = null;
+        } catch (e) {
+        }
+        thread.remove();
+    }
+    let spacer = container.querySelector(':scope > #trimmed-comments-spacer');
+    if (!spacer) {
+        spacer = document.createElement('div');
+        spacer.id = 'trimmed-comments-spacer';
+        container.prepend(spacer);
+    }
+    spacer.style.height = ((parseFloat(spacer.style.height) || 0) + removedHeight) + 'px';
+}
+return {
+    removed: numberToRemove,
+    remaining: document.querySelectorAll('ytd-comment-thread-renderer').length,
+    dom_nodes: document.getElementsByTagName('*').length,
+    used_heap: performance.memory ? performance.memory.usedJSHeapSize : null
+};
+'''
+
+# Progress snapshot used by ScrollPlanner after a scroll: page height, viewport
+# height, number of comment threads rendered since the last snapshot (each
+# thread is counted once, even after it is recycled or trimmed), whether the
+# comment section still has a continuation element left to load and whether its
+# spinner is inside the viewport (the continuation is still loading).
+SCROLL_PROGRESS_SCRIPT = '''
+const newThreads = document.querySelectorAll('ytd-comment-thread-renderer:not([data-counted])');
+for (const thread of newThreads) {
+    thread.setAttribute('data-counted', '');
+}
+const hasContinuation = Array.from(document.querySelectorAll('ytd-comments ytd-continuation-item-renderer')).some(
+    (continuation) => !continuation.closest('ytd-comment-thread-renderer')
+);
+const spinner = document.querySelector('ytd-comments ytd-continuation-item-renderer #spinner, ytd-comments ytd-continuation-item-renderer tp-yt-paper-spinner');
+let spinnerVisible = false;
+if (spinner && spinner.offsetParent !== null) {
+    const rect = spinner.getBoundingClientRect();
+    spinnerVisible = rect.bottom > 0 && rect.top < window.innerHeight;
+}
+return [
+    document.documentElement.scrollHeight,
+    window.innerHeight,
+    newThreads.length,
+    hasContinuation,
+    spinnerVisible
+];
+'''
+
+# Returns the comment ids of harvested threads that still have replies to
+# expand, each thread only once, so they can be handed to reply tabs.
+REPLY_THREAD_IDS_SCRIPT = '''
+const commentIds = [];
+for (const thread of document.querySelectorAll('ytd-comment-thread-renderer[data-harvested]:not([data-replies-queued])')) {
+    if (!thread.querySelector('#more-replies')) {
+        continue;
+    }
+    const time = thread.querySelector('#published-time-text a, #header-author yt-formatted-string a');
+    const match = (time ? (time.getAttribute('href') || '') : '').match(/[?&]lc=([^&#]+)/);
+    if (match) {
+        thread.setAttribute('data-replies-queued', '');
+        commentIds.push(match[1]);
+    }
+}
+return commentIds;
+'''
+
+# On a comment permalink page (&lc=<id>), marks every comment thread except
+# the linked one as harvested, so the only_new clicks and extraction only touch
+# the linked thread. Returns whether the linked thread is rendered.
+REPLY_TARGET_SCRIPT = '''
+const commentId = arguments[0];
+let found = false;
+for (const thread of document.querySelectorAll('ytd-comment-thread-renderer')) {
+    const time = thread.querySelector('#published-time-text a, #header-author yt-formatted-string a');
+    const match = (time ? (time.getAttribute('href') || '') : '').match(/[?&]lc=([^&#]+)/);
+    if (match && match[1] === commentId) {
+        thread.removeAttribute('data-harvested');
+        found = true;
+    } else {
+        thread.setAttribute('data-harvested', '');
+    }
+}
+return found;
+'''
+
+# Indices of the entries in the comment sort menu
+SORT_ORDERS: Dict[str, int] = {'top': 0, 'newest': 1}
+
+COMMENT_COLUMNS: Tuple[str, ...] = ('comment_text', 'time_elapsed_since_comment', 'author', 'time_of_collection', 'from_video', 'tags', 'comment_id')
 
 class YoutubeVideo:
     
-    def __init__(self, video_title: str, video_url: str, channel: str, release_date: str, tags: Optional[str] = None):
+    __slots__ = ('video_title', 'video_url', 'channel', 'release_date', 'tags', 'count_of_total_comments')
+    
+    def __init__(self, video_title: str, video_url: str, channel: str, release_date: str, tags: Optional[str] = None, count_of_total_comments: Optional[int] = None):
         self.video_title = video_title
         self.video_url = video_url
         self.channel = channel
         self.release_date = release_date
         self.tags = tags
+        self.count_of_total_comments = count_of_total_comments
         
 class YoutubeComment:
     
-    def __init__(self, comment_text: str, time_elapsed_since_comment: str, author: str, time_of_collection: str, from_video: str, tags: Optional[str] = None) -> None:
+    __slots__ = COMMENT_COLUMNS
+    
+    def __init__(self, comment_text: str, time_elapsed_since_comment: str, author: str, time_of_collection: str, from_video: str, tags: Optional[str] = None, comment_id: Optional[str] = None) -> None:
         self.comment_text = comment_text
         self.time_elapsed_since_comment = time_elapsed_since_comment
         self.author = author
         self.time_of_collection = time_of_collection
         self.from_video = from_video
         self.tags = tags
-
-class YoutubeCommentScraper:
-
-    def __init__(self, edge_driver_path: str, video_title: str, video_url: str, tags: Optional[str] = None, ) -> None:
+        self.comment_id = comment_id
         
-        self.edge_driver_path = edge_driver_path
-        self.video_title = video_title
-        self.video_url = video_url
+class YoutubeCommentBatch:
+    
+    # Columnar storage for the comments of one video. Per-comment fields are
+    # kept in one list per column, the per-video fields (time_of_collection,
+    # from_video, tags) are stored once, and the few distinct timestamps such
+    # as "3 years ago" share a single string each. It behaves like the list of
+    # YoutubeComment it replaces: len(), iteration, indexing and append().
+    
+    __slots__ = ('time_of_collection', 'from_video', 'tags', 'comment_text', 'time_elapsed_since_comment', 'author', 'comment_id', '_timestamps')
+    
+    def __init__(self, time_of_collection: Optional[str] = None, from_video: Optional[str] = None, tags: Optional[str] = None) -> None:
+        
+        self.time_of_collection = time_of_collection
+        self.from_video = from_video
         self.tags = tags
-        self.scraped_youtube_comments: List[YoutubeComment] = []
-        self.count_of_total_comments: int = 0
+        self.comment_text: List[str] = []
+        self.time_elapsed_since_comment: List[str] = []
+        self.author: List[str] = []
+        self.comment_id: List[Optional[str]] = []
+        self._timestamps: Dict[str, str] = {}
+        
+    def __len__(self) -> int:
+        
+        return len(self.comment_text)
+    
+    def __getitem__(self, index):
+        
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        
+        return YoutubeComment(self.comment_text[index], self.time_elapsed_since_comment[index], self.author[index], self.time_of_collection, self.from_video, self.tags, self.comment_id[index])
+    
+    def __iter__(self):
+        
+        for i in range(len(self)):
+            yield self[i]
+            
+    def append(self, comment: YoutubeComment) -> None:
+        
+        if len(self) == 0:
+            
+            self.time_of_collection = comment.time_of_collection
+            self.from_video = comment.from_video
+            self.tags = comment.tags
+            
+        elif (comment.time_of_collection, comment.from_video, comment.tags) != (self.time_of_collection, self.from_video, self.tags):
+            
+            raise ValueError('A YoutubeCommentBatch only holds comments collected from one video at one time')
+        
+        self.append_values(comment.comment_text, comment.time_elapsed_since_comment, comment.author, comment.comment_id)
+        
+    def append_values(self, comment_text: str, time_elapsed_since_comment: str, author: str, comment_id: Optional[str] = None) -> None:
+        
+        self.comment_text.append(comment_text)
+        self.time_elapsed_since_comment.append(self._timestamps.setdefault(time_elapsed_since_comment, time_elapsed_since_comment))
+        self.author.append(author)
+        self.comment_id.append(comment_id)
+        
+    def extend(self, comments) -> None:
+        
+        for comment in comments:
+            self.append(comment)
+            
+    def to_pandas(self, postprocess: bool = False) -> pd.DataFrame:
+        
+        # The string columns only reference the stored strings, and the
+        # per-video columns are single-category Categoricals, so no string is
+        # copied per row. With postprocess, the typed columns of
+        # postprocess_comments are added.
+        comments = pd.DataFrame({
+            'comment_text': pd.Series(self.comment_text, dtype=object),
+            'time_elapsed_since_comment': pd.Series(self.time_elapsed_since_comment, dtype=object),
+            'author': pd.Series(self.author, dtype=object),
+            'time_of_collection': self._get_constant_categorical(self.time_of_collection),
+            'from_video': self._get_constant_categorical(self.from_video),
+            'tags': self._get_constant_categorical(self.tags),
+            'comment_id': pd.Series(self.comment_id, dtype=object)
+        }, columns=list(COMMENT_COLUMNS))
+        
+        if postprocess:
+            return postprocess_comments(comments)
+        
+        return comments
+    
+    def to_arrow(self):
+        
+        if pa is None:
+            raise ImportError('pyarrow is required to convert comments to an Arrow table')
+        
+        indices = pa.array(np.zeros(len(self), dtype=np.int8))
+        
+        return pa.table({
+            'comment_text': pa.array(self.comment_text, type=pa.string()),
+            'time_elapsed_since_comment': pa.array(self.time_elapsed_since_comment, type=pa.string()),
+            'author': pa.array(self.author, type=pa.string()),
+            'time_of_collection': pa.DictionaryArray.from_arrays(indices, pa.array([self.time_of_collection], type=pa.string())),
+            'from_video': pa.DictionaryArray.from_arrays(indices, pa.array([self.from_video], type=pa.string())),
+            'tags': pa.DictionaryArray.from_arrays(indices, pa.array([self.tags], type=pa.string())),
+            'comment_id': pa.array(self.comment_id, type=pa.string())
+        })
+    
+    def _get_constant_categorical(self, value: Optional[str]) -> pd.Categorical:
+        
+        if value is None:
+            return pd.Categorical.from_codes(np.full(len(self), -1, dtype=np.int8), categories=[])
+        
+        return pd.Categorical.from_codes(np.zeros(len(self), dtype=np.int8), categories=[value])
+
+# Relative timestamps as YouTube displays them ("3 years ago (edited)"), with
+# the length of each unit in seconds. Months and years are averaged, so the
+# estimated dates are approximate at those scales anyway.
+RELATIVE_TIME_PATTERN: str = r'(\d+)\s+(second|minute|hour|day|week|month|year)s?\s+ago'
+RELATIVE_TIME_UNIT_SECONDS: Dict[str, float] = {
+    'second': 1,
+    'minute': 60,
+    'hour': 3600,
+    'day': 86400,
+    'week': 7 * 86400,
+    'month': 30.436875 * 86400,
+    'year': 365.2425 * 86400
+}
+
+# Language hints from the script a comment is written in, checked in order.
+# Kana decides Japanese before Han does Chinese; Latin script text only gets
+# 'latin', since the script does not tell the language.
+LANGUAGE_HINT_PATTERNS: Tuple[Tuple[str, str], ...] = (
+    ('ja', r'[぀-ヿ]'),
+    ('ko', r'[가-힯ᄀ-ᇿ]'),
+    ('zh', r'[一-鿿]'),
+    ('th', r'[฀-๿]'),
+    ('ar', r'[؀-ۿ]'),
+    ('he', r'[֐-׿]'),
+    ('hi', r'[ऀ-ॿ]'),
+    ('el', r'[Ͱ-Ͽ]'),
+    ('ru', r'[Ѐ-ӿ]'),
+    ('latin', r'[A-Za-zÀ-ɏ]')
+)
+
+def postprocess_comments(comments: pd.DataFrame) -> pd.DataFrame:
+    
+    # Adds typed columns derived from the scraped strings, computed over whole
+    # columns at once: estimated_date_of_comment (the end of the collection day
+    # minus the relative time, NaT when it cannot be parsed), is_edited, author_handle
+    # (NFKC, casefolded, without the leading @), comment_length and
+    # language_hint. Timestamps and authors repeat a lot, so they are parsed
+    # once per distinct value and spread back to the rows by their codes.
+    time_elapsed = comments['time_elapsed_since_comment'].astype(object).fillna('').astype(str)
+    time_elapsed_codes, time_elapsed_values = pd.factorize(time_elapsed)
+    relative_time = pd.Series(time_elapsed_values, dtype=object).str.extract(RELATIVE_TIME_PATTERN)
+    
+    amounts = pd.to_numeric(relative_time[0]).to_numpy(dtype=np.float64)[time_elapsed_codes]
+    unit_seconds = relative_time[1].map(RELATIVE_TIME_UNIT_SECONDS).to_numpy(dtype=np.float64)[time_elapsed_codes]
+    is_edited = pd.Series(time_elapsed_values, dtype=object).str.contains('(edited)', regex=False).to_numpy(dtype=bool)[time_elapsed_codes]
+    
+    time_of_collection = pd.to_datetime(comments['time_of_collection'].astype(object), errors='coerce').to_numpy(dtype='datetime64[ns]')
+    
+    # Only the collection date is known, so "5 hours ago" may be the same day;
+    # counting back from its last instant keeps such comments on that day.
+    end_of_collection_day = time_of_collection.astype('datetime64[D]').astype('datetime64[ns]') + np.timedelta64(1, 'D') - np.timedelta64(1, 'ns')
+    
+    estimated_date_of_comment = pd.Series(end_of_collection_day - pd.to_timedelta(amounts * unit_seconds, unit='s').to_numpy(), index=comments.index).dt.floor('D')
+    
+    author_codes, author_values = pd.factorize(comments['author'].astype(object).fillna('').astype(str))
+    author_handles = pd.Series(author_values, dtype=object).str.normalize('NFKC').str.strip().str.replace(r'\s+', ' ', regex=True).str.lstrip('@').str.casefold()
+    author_handle = pd.Series(author_handles.replace('', None).to_numpy(dtype=object)[author_codes], index=comments.index, dtype=object)
+    
+    comment_text = comments['comment_text'].astype(object).fillna('').astype(str)
+    
+    language_hint = pd.Series(np.select(
+        [comment_text.str.contains(pattern, regex=True).to_numpy() for _, pattern in LANGUAGE_HINT_PATTERNS],
+        [hint for hint, _ in LANGUAGE_HINT_PATTERNS],
+        default='und'
+    ), index=comments.index)
+    
+    return comments.assign(
+        estimated_date_of_comment=estimated_date_of_comment,
+        is_edited=is_edited,
+        author_handle=author_handle,
+        comment_length=comment_text.str.len(),
+        language_hint=language_hint.astype('category')
+    )
 
-    def scrape_comments(self, number_of_comments_to_scrape: int, scrape_method: str = 'simple', scrape_replies: bool = False) -> None:
+class CommentSink(ABC):
+    
+    # Appends comments to a file in fixed-size chunks while they are harvested,
+    # and fsyncs after every chunk so that a crash only loses the current chunk.
+    # Subclasses open the file in _open and write a chunk in _write_chunk.
+    
+    columns: Tuple[str, ...] = COMMENT_COLUMNS
+    
+    def __init__(self, path: str, chunk_size: int = 500) -> None:
         
-        time_of_collection: str = date.today().strftime('%Y-%m-%d')
-        current_height: int = 0
+        self.path = path
+        self.chunk_size = chunk_size
+        self.count_of_written_comments: int = 0
+        self._buffer: List[YoutubeComment] = []
+        self._file = self._open()
+        
+    def __enter__(self) -> 'CommentSink':
+        
+        return self
+    
+    def __exit__(self, *args) -> None:
+        
+        self.close()
+        
+    def write(self, comment: YoutubeComment) -> None:
         
-        scroll_end_times = int
+        self._buffer.append(comment)
         
-        if len(self.scraped_youtube_comments) > 0:
+        if len(self._buffer) >= self.chunk_size:
+            self.flush()
             
-            logging.info('You must clear comments before you can scrape comments')
+    def write_many(self, comments: List[YoutubeComment]) -> None:
+        
+        for comment in comments:
+            self.write(comment)
+            
+    def flush(self) -> None:
+        
+        written: int = len(self._buffer)
+        
+        if self._buffer:
+            
+            self._write_chunk(self._buffer)
+            self._buffer = []
             
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        
+        # Only counted once on disk
+        self.count_of_written_comments += written
+        
+    def close(self) -> None:
+        
+        if self._file.closed:
             return
+        
+        self.flush()
+        self._close()
+        
+    @abstractmethod
+    def _open(self):
+        
+        pass
+    
+    @abstractmethod
+    def _write_chunk(self, comments: List[YoutubeComment]) -> None:
+        
+        pass
+    
+    def _close(self) -> None:
+        
+        self._file.close()
 
-        with Edge(executable_path=self.edge_driver_path) as driver:
+class CsvCommentSink(CommentSink):
+    
+    def _open(self):
+        
+        csv_file = open(self.path, 'w', encoding='utf-8-sig', newline='')
+        
+        self._writer = csv.writer(csv_file)
+        self._writer.writerow(self.columns)
+        
+        return csv_file
+    
+    def _write_chunk(self, comments: List[YoutubeComment]) -> None:
+        
+        self._writer.writerows([getattr(c, column) for column in self.columns] for c in comments)
+
+class JsonLinesCommentSink(CommentSink):
+    
+    def _open(self):
+        
+        return open(self.path, 'w', encoding='utf-8')
+    
+    def _write_chunk(self, comments: List[YoutubeComment]) -> None:
+        
+        self._file.writelines(json.dumps({column: getattr(c, column) for column in self.columns}, ensure_ascii=False) + '\n' for c in comments)
+
+class ParquetCommentSink(CommentSink):
+    
+    # Every chunk becomes one row group. The Parquet footer is only written on
+    # close, so unlike CSV and JSON Lines a crashed run leaves an unreadable file.
+    
+    def _open(self):
+        
+        if pa is None:
+            raise ImportError('pyarrow is required to write Parquet output')
+        
+        parquet_file = open(self.path, 'wb')
+        
+        self._schema = pa.schema([(column, pa.string()) for column in self.columns])
+        self._writer = pq.ParquetWriter(parquet_file, self._schema)
+        
+        return parquet_file
+    
+    def _write_chunk(self, comments: List[YoutubeComment]) -> None:
+        
+        self._writer.write_table(pa.table({column: [getattr(c, column) for c in comments] for column in self.columns}, schema=self._schema))
+        
+    def _close(self) -> None:
+        
+        self._writer.close()
+        self._file.close()
+        
+def create_comment_sink(path: str, chunk_size: int = 500) -> CommentSink:
+    
+    extension: str = os.path.splitext(path)[1].lower()
+    
+    if extension == '.csv':
+        return CsvCommentSink(path, chunk_size)
+    elif extension in ('.jsonl', '.ndjson'):
+        return JsonLinesCommentSink(path, chunk_size)
+    elif extension == '.parquet':
+        return ParquetCommentSink(path, chunk_size)
+    
+    raise ValueError(f'Output format does not exist: {extension}')
+
+class AsyncCommentWriter:
+    
+    # Writes the comments of many concurrent scrapes from a single task. Sinks
+    # wrapped by get_sink hand their chunks over a bounded queue, and a scrape
+    # whose chunk does not fit waits until the writer catches up, so a slow
+    # disk slows the scrapes down instead of piling comments up in memory.
+    # Chunks are written on a thread of the writer's own.
+    
+    def __init__(self, max_pending_chunks: int = 16) -> None:
+        
+        self.max_pending_chunks = max_pending_chunks
+        self.peak_pending_chunks: int = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._task: Optional[asyncio.Task] = None
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        
+    async def __aenter__(self) -> 'AsyncCommentWriter':
+        
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(self.max_pending_chunks)
+        self._task = asyncio.create_task(self._write_chunks())
+        
+        return self
+    
+    async def __aexit__(self, *args) -> None:
+        
+        await self._queue.put(None)
+        await self._task
+        
+        self._executor.shutdown()
+        
+    def get_sink(self, comment_sink: CommentSink) -> 'QueuedCommentSink':
+        
+        return QueuedCommentSink(comment_sink, self)
+    
+    def put(self, comment_sink: CommentSink, comments: Optional[List[YoutubeComment]], closed: Optional[threading.Event] = None) -> None:
+        
+        # Called from executor threads, never from the event loop thread. None
+        # as comments closes the sink once everything before it is written,
+        # and sets closed afterwards.
+        asyncio.run_coroutine_threadsafe(self._queue.put((comment_sink, comments, closed)), self._loop).result()
+        
+    async def _write_chunks(self) -> None:
+        
+        while True:
             
-            driver.get(self.video_url)
+            self.peak_pending_chunks = max(self.peak_pending_chunks, self._queue.qsize())
             
-            while True:
-                try:
-                    count_of_all_youtube_comments_element = WebDriverWait(driver, 1).until(
-                        EC.presence_of_element_located((By.CSS_SELECTOR, "#count > yt-formatted-string > span:nth-child(1)"))
-                    )
-                    break
-                except:
-                    pass
-                
-                self._scroll_down(driver, 0.5)
-                
-            self.count_of_total_comments = int(count_of_all_youtube_comments_element.text.replace(',', ''))
+            item = await self._queue.get()
             
-            scroll_end_times = self._get_scroll_end_times(self.count_of_total_comments, number_of_comments_to_scrape)
+            if item is None:
+                break
             
-            logging.info(f'Times to scroll end: {scroll_end_times}')
+            comment_sink, comments, closed = item
             
-            if scrape_method not in ('simple', 'batched', 'expensive'):
-                
-                logging.info(f'Scrape method does not exist: {scrape_method}')
-                
-            elif scrape_method == 'simple':
-                
-                logging.info('Scrape method starts: simple')
-                
-                scroll_end_count: int = 0
-                
-                scroll_down_times = int
+            try:
+                await self._loop.run_in_executor(self._executor, self._write_chunk, comment_sink, comments)
+            except Exception as e:
+                # Keeps draining, so no scrape stays blocked on a full queue
+                logging.info(f'Writing to {comment_sink.path} failed: {e!r}')
                 
-                logging.info('Started scrolling end...')             
+            if closed is not None:
+                closed.set()
                 
-                for i in range(scroll_end_times):
+    def _write_chunk(self, comment_sink: CommentSink, comments: Optional[List[YoutubeComment]]) -> None:
+        
+        if comments is None:
+            
+            comment_sink.close()
+            
+        else:
+            
+            comment_sink.write_many(comments)
+            comment_sink.flush()
+
+class QueuedCommentSink(CommentSink):
+    
+    # Collects chunks like a sink does and hands each one to an
+    # AsyncCommentWriter instead of writing it. Closing it waits until the
+    # writer has written the last chunk and closed the wrapped sink.
+    
+    def __init__(self, comment_sink: CommentSink, comment_writer: AsyncCommentWriter) -> None:
+        
+        self.path = comment_sink.path
+        self.chunk_size = comment_sink.chunk_size
+        self._buffer: List[YoutubeComment] = []
+        self._comment_sink = comment_sink
+        self._comment_writer = comment_writer
+        self._closed: bool = False
+        self._file = self._open()
+        
+    def flush(self) -> None:
+        
+        if self._buffer:
+            
+            self._write_chunk(self._buffer)
+            self._buffer = []
+            
+    @property
+    def count_of_written_comments(self) -> int:
+        
+        # Chunks still queued for the writer are not written yet
+        return self._comment_sink.count_of_written_comments
+            
+    def close(self) -> None:
+        
+        if self._closed:
+            return
+        
+        self.flush()
+        
+        closed = threading.Event()
+        
+        self._comment_writer.put(self._comment_sink, None, closed)
+        closed.wait()
+        
+        self._closed = True
+        
+    def _open(self):
+        
+        # The wrapped sink holds the file
+        return None
+    
+    def _write_chunk(self, comments: List[YoutubeComment]) -> None:
+        
+        self._comment_writer.put(self._comment_sink, comments)
+
+class CommentDedupIndex:
+    
+    # Keeps an 8-byte BLAKE2b digest per comment instead of the comment itself.
+    # The digest is taken from the comment id, or from author, text and
+    # timestamp when the id is unknown. With a path, digests are also appended
+    # to that file and loaded again by the next run. They are appended by
+    # persist once the comments they stand for are on disk, so a crash never
+    # leaves comments that were not saved marked as collected. Records restored
+    # from a checkpoint are only checked against the digests of this run, as
+    # the interrupted run may have written theirs already.
+    
+    digest_size: int = 8
+    
+    def __init__(self, path: Optional[str] = None) -> None:
+        
+        self.path = path
+        self.last_batch_duplicates: int = 0
+        self.last_batch_cut: bool = False
+        self._digests = set()
+        self._run_digests = set()
+        self._pending_digests: List[int] = []
+        self._count_of_added_digests: int = 0
+        self._file = None
+        self._lock = threading.Lock()
+        
+        if path is not None:
+            
+            if os.path.exists(path):
                 
-                    self._scroll_end(driver, 3)
-                    scroll_end_count += 1
+                with open(path, 'rb') as digest_file:
+                    data = digest_file.read()
                     
-                    new_height: int = driver.execute_script('return document.documentElement.scrollHeight')
+                # A trailing partial digest from a crash is ignored
+                for offset in range(0, len(data) - self.digest_size + 1, self.digest_size):
+                    self._digests.add(int.from_bytes(data[offset:offset + self.digest_size], 'little'))
                     
-                    if new_height <= current_height:
-                        
-                        logging.info('Scrolling ends due to reaching end...')
-                        
-                        break
-                    
-                    current_height = new_height
-                    
-                logging.info(f'Scroll end count: {scroll_end_count}')
-                        
-                if scrape_replies:
+                logging.info(f'Loaded {len(self._digests)} comment hashes from {path}')
+                
+            self._file = open(path, 'ab')
+            
+    def __len__(self) -> int:
+        
+        return len(self._digests)
+    
+    def __contains__(self, comment_record: Dict[str, str]) -> bool:
+        
+        return self._get_digest(comment_record) in self._digests
+    
+    def add_new(self, comment_records: List[Dict[str, str]], limit: Optional[int] = None, restored: bool = False) -> List[Dict[str, str]]:
+        
+        # Records after the first limit new ones are neither returned nor
+        # indexed, so they can still be collected later.
+        new_records: List[Dict[str, str]] = []
+        new_digests: List[int] = []
+        duplicates: int = 0
+        cut: bool = False
+        
+        with self._lock:
+            
+            for r in comment_records:
+                
+                if limit is not None and len(new_records) >= limit:
                     
-                    self._click_to_see_replies(driver)
-                    self._click_to_see_more_replies(driver)                
+                    cut = True
                     
-                self._click_to_read_more(driver)
+                    break
                 
-                if scrape_replies:
+                digest: int = self._get_digest(r)
+                
+                if digest not in (self._run_digests if restored else self._digests):
                     
-                    scroll_down_times = self._get_scroll_down_times(scroll_end_count=scroll_end_count, scroll_down_from_top=True)
+                    # A restored digest that is in the file already is not
+                    # written again
+                    if digest not in self._digests:
+                        new_digests.append(digest)
                     
-                    logging.info('Started scrolling top...')
+                    self._digests.add(digest)
+                    self._run_digests.add(digest)
+                    new_records.append(r)
                     
-                    self._scroll_top(driver, 1)
+                else:
+                    duplicates += 1
                     
-                    logging.info('Started scrolling down...')
+            self.last_batch_duplicates = duplicates
+            self.last_batch_cut = cut
+            self._count_of_added_digests += len(new_records)
                     
-                    for i in range(scroll_down_times):
-                        
-                        self._scroll_down(driver, 1.5)
-                        
-                logging.info(f'Scroll down times: {scroll_down_times}')
+            if self._file is not None:
+                self._pending_digests.extend(new_digests)
                 
-                comment_text_list, time_elapsed_since_comment_list, author_list = self._get_comment_data(driver)
-                    
-            elif scrape_method == 'batched':
+        return new_records
+    
+    def persist(self, count_of_durable_comments: Optional[int] = None) -> None:
+        
+        # Appends the digests of the first count_of_durable_comments comments
+        # added by add_new (of all of them with None) that are not in the file
+        # yet.
+        with self._lock:
+            
+            if self._file is None:
+                return
+            
+            number_of_digests: int = len(self._pending_digests)
+            
+            if count_of_durable_comments is not None:
+                number_of_digests = min(number_of_digests, count_of_durable_comments - (self._count_of_added_digests - len(self._pending_digests)))
+                
+            if number_of_digests <= 0:
+                return
+            
+            self._file.write(b''.join(d.to_bytes(self.digest_size, 'little') for d in self._pending_digests[:number_of_digests]))
+            self._file.flush()
+            os.fsync(self._file.fileno())
+            
+            del self._pending_digests[:number_of_digests]
+    
+    def close(self) -> None:
+        
+        if self._file is not None:
+            
+            self._file.close()
+            self._file = None
+    
+    def _get_digest(self, comment_record: Dict[str, str]) -> int:
+        
+        if comment_record['comment_id']:
+            key: str = 'id\x1f' + comment_record['comment_id']
+        else:
+            key = '\x1f'.join(('text', comment_record['author'], comment_record['comment_text'], comment_record['time_elapsed_since_comment']))
+            
+        return int.from_bytes(hashlib.blake2b(key.encode('utf-8'), digest_size=self.digest_size).digest(), 'little')
+
+class CommentStore:
+    
+    # A per-video SQLite store of every comment collected across runs, keyed
+    # by comment id, or by author and text when the id is unknown (the
+    # relative timestamp changes between runs). first_seen and last_seen are
+    # the collection dates of the first and the latest run that saw a comment.
+    
+    def __init__(self, path: str) -> None:
+        
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('CREATE TABLE IF NOT EXISTS comments (comment_key TEXT PRIMARY KEY, comment_id TEXT, comment_text TEXT, time_elapsed_since_comment TEXT, author TEXT, first_seen TEXT, last_seen TEXT)')
+        self._connection.commit()
+        
+    def __enter__(self) -> 'CommentStore':
+        
+        return self
+    
+    def __exit__(self, *args) -> None:
+        
+        self.close()
+        
+    def __len__(self) -> int:
+        
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM comments').fetchone()[0]
+        
+    def get_known_keys(self, comment_records: List[Dict[str, str]]) -> set:
+        
+        comment_keys: List[str] = [self.get_comment_key(r) for r in comment_records]
+        known_keys = set()
+        
+        with self._lock:
+            
+            # Stays below SQLite's limit on query parameters
+            for i in range(0, len(comment_keys), 500):
+                
+                chunk: List[str] = comment_keys[i:i + 500]
+                known_keys.update(row[0] for row in self._connection.execute(f'SELECT comment_key FROM comments WHERE comment_key IN ({", ".join("?" * len(chunk))})', chunk))
+                
+        return known_keys
+    
+    def merge(self, comment_records: List[Dict[str, str]], time_of_collection: str) -> None:
+        
+        # New comments are inserted, known ones get the latest text, timestamp
+        # and last_seen.
+        if not comment_records:
+            return
+        
+        with self._lock:
+            
+            self._connection.executemany(
+                'INSERT INTO comments VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT(comment_key) DO UPDATE SET comment_text = excluded.comment_text, time_elapsed_since_comment = excluded.time_elapsed_since_comment, last_seen = excluded.last_seen',
+                [(self.get_comment_key(r), r['comment_id'] or None, r['comment_text'], r['time_elapsed_since_comment'], r['author'], time_of_collection, time_of_collection) for r in comment_records]
+            )
+            self._connection.commit()
+            
+    def close(self) -> None:
+        
+        with self._lock:
+            self._connection.close()
+            
+    @staticmethod
+    def get_comment_key(comment_record: Dict[str, str]) -> str:
+        
+        if comment_record['comment_id']:
+            return comment_record['comment_id']
+        
+        return 'text\x1f' + comment_record['author'] + '\x1f' + comment_record['comment_text']
+
+class ScrapeCheckpoint:
+    
+    # Harvested records are appended to <path>.records.jsonl and the scrape
+    # position is kept in <path>.state.json. Records are written and fsynced
+    # before the state that refers to them, so a crash in between only means a
+    # few records are restored twice and deduplicated on resume. The state is
+    # marked finished only once the comments are exhausted; a run that stopped
+    # at its target keeps its position, so a later run with a higher target
+    # continues from there.
+    
+    def __init__(self, path: str, checkpoint_interval: int = 200) -> None:
+        
+        self.records_path = f'{path}.records.jsonl'
+        self.state_path = f'{path}.state.json'
+        self.checkpoint_interval = checkpoint_interval
+        self._records_file = None
+        self._buffer: List[Dict[str, str]] = []
+        self._scrape_method: Optional[str] = None
+        self._position: dict = {}
+        
+    def load_records(self, chunk_size: int = 1000):
+        
+        if not os.path.exists(self.records_path):
+            return
+        
+        chunk: List[Dict[str, str]] = []
+        
+        with open(self.records_path, encoding='utf-8') as records_file:
+            
+            for line in records_file:
+                
+                try:
+                    chunk.append(json.loads(line))
+                except ValueError:
+                    # A line cut short by a crash
+                    continue
+                
+                if len(chunk) >= chunk_size:
+                    
+                    yield chunk
+                    chunk = []
+                    
+        if chunk:
+            yield chunk
+    
+    def load_state(self) -> dict:
+        
+        if not os.path.exists(self.state_path):
+            return {}
+        
+        with open(self.state_path, encoding='utf-8') as state_file:
+            return json.load(state_file)
+        
+    def open(self, scrape_method: str, resume: bool) -> None:
+        
+        self._scrape_method = scrape_method
+        self._records_file = open(self.records_path, 'a' if resume else 'w', encoding='utf-8')
+        
+        if resume:
+            
+            # Kept until the resumed run moves on, so a run that fails before
+            # storing anything does not lose the position.
+            state = self.load_state()
+            
+            if state.get('scrape_method') == scrape_method:
+                self._position = state.get('position', {})
+                
+        else:
+            
+            self._write_state(False)
+        
+    def add(self, comment_records: List[Dict[str, str]], position: Optional[dict]) -> bool:
+        
+        # Returns whether the records were saved. Without a position, the
+        # previous one is kept.
+        self._buffer.extend(comment_records)
+        
+        if position is not None:
+            self._position = position
+        
+        if len(self._buffer) >= self.checkpoint_interval:
+            
+            self.save()
+            
+            return True
+        
+        return False
+            
+    def save(self, finished: bool = False) -> None:
+        
+        self._records_file.writelines(json.dumps(r, ensure_ascii=False) + '\n' for r in self._buffer)
+        self._records_file.flush()
+        os.fsync(self._records_file.fileno())
+        
+        self._buffer = []
+        
+        self._write_state(finished)
+        
+        logging.info(f'Saved checkpoint: {self._position}')
+        
+    def close(self, finished: bool) -> None:
+        
+        # finished means the comments are exhausted, not that the run ended
+        self.save(finished)
+        self._records_file.close()
+        
+    def _write_state(self, finished: bool) -> None:
+        
+        temporary_path: str = f'{self.state_path}.tmp'
+        
+        with open(temporary_path, 'w', encoding='utf-8') as state_file:
+            
+            json.dump({'scrape_method': self._scrape_method, 'position': self._position, 'finished': finished}, state_file)
+            state_file.flush()
+            os.fsync(state_file.fileno())
+            
+        os.replace(temporary_path, self.state_path)
+
+class ScrapeMetrics:
+    
+    # Per-run timers and counters for scrape_comments. Phases are timed
+    # exclusively (they do not nest), so their times add up to the time spent
+    # in instrumented work. Every WebDriver command is counted by name, and with
+    # record_command_latency a latency histogram per command is kept as well.
+    
+    latency_buckets_ms: Tuple[float, ...] = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000, 2000, 5000, 10000)
+    
+    def __init__(self, record_command_latency: bool = False) -> None:
+        
+        self.record_command_latency = record_command_latency
+        self.started_at: str = datetime.now().isoformat(timespec='seconds')
+        self.phase_seconds: Dict[str, float] = {}
+        self.phase_counts: Dict[str, int] = {}
+        self.counters: Dict[str, int] = {}
+        self.command_counts: Dict[str, int] = {}
+        self.command_seconds: Dict[str, float] = {}
+        self.command_histograms: Dict[str, List[int]] = {}
+        self.details: Dict[str, object] = {}
+        self._started: float = time.monotonic()
+        self._elapsed: Optional[float] = None
+        self._lock = threading.Lock()
+        
+    @contextmanager
+    def phase(self, name: str):
+        
+        started: float = time.monotonic()
+        
+        try:
+            yield
+        finally:
+            
+            elapsed: float = time.monotonic() - started
+            
+            with self._lock:
+                
+                self.phase_seconds[name] = self.phase_seconds.get(name, 0.0) + elapsed
+                self.phase_counts[name] = self.phase_counts.get(name, 0) + 1
+                
+    def count(self, name: str, value: int = 1) -> None:
+        
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+            
+    def instrument_driver(self, driver: WebDriver) -> None:
+        
+        # Every WebDriver call (find_elements, execute_script, send_keys, ...)
+        # ends up in driver.execute, so wrapping it sees all round trips. A
+        # pooled driver is re-wrapped for every run, never wrapped twice.
+        execute = getattr(driver, '_unwrapped_execute', driver.execute)
+        driver._unwrapped_execute = execute
+        
+        def timed_execute(driver_command: str, params: Optional[dict] = None):
+            
+            started: float = time.monotonic()
+            
+            try:
+                return execute(driver_command, params)
+            finally:
+                self._record_command(driver_command, time.monotonic() - started)
+                
+        driver.execute = timed_execute
+        
+    def finish(self) -> None:
+        
+        self._elapsed = time.monotonic() - self._started
+        
+    def get_report(self) -> dict:
+        
+        with self._lock:
+            
+            report = {
+                'started_at': self.started_at,
+                'elapsed_seconds': round(self._elapsed if self._elapsed is not None else time.monotonic() - self._started, 3),
+                'phases': {name: {'seconds': round(seconds, 3), 'count': self.phase_counts[name]} for name, seconds in self.phase_seconds.items()},
+                'counters': dict(self.counters),
+                'commands': {name: {'count': count, 'seconds': round(self.command_seconds[name], 3)} for name, count in self.command_counts.items()},
+                **self.details
+            }
+            
+            if self.record_command_latency:
+                
+                for name, histogram in self.command_histograms.items():
+                    report['commands'][name]['latency_histogram_ms'] = {f'<={bound:g}' if bound != float('inf') else f'>{self.latency_buckets_ms[-1]:g}': n for bound, n in zip(self.latency_buckets_ms + (float('inf'),), histogram) if n}
+                    
+        return report
+    
+    def save_report(self, path: str) -> None:
+        
+        with open(path, 'w', encoding='utf-8') as report_file:
+            json.dump(self.get_report(), report_file, indent=2, ensure_ascii=False)
+            
+    def _record_command(self, driver_command: str, elapsed: float) -> None:
+        
+        with self._lock:
+            
+            self.command_counts[driver_command] = self.command_counts.get(driver_command, 0) + 1
+            self.command_seconds[driver_command] = self.command_seconds.get(driver_command, 0.0) + elapsed
+            
+            if 'Script' in driver_command:
+                self.counters['script_calls'] = self.counters.get('script_calls', 0) + 1
+            
+            if self.record_command_latency:
+                
+                histogram = self.command_histograms.setdefault(driver_command, [0] * (len(self.latency_buckets_ms) + 1))
+                elapsed_ms: float = elapsed * 1000
+                
+                for i, bound in enumerate(self.latency_buckets_ms):
+                    
+                    if elapsed_ms <= bound:
+                        
+                        histogram[i] += 1
+                        break
+                    
+                else:
+                    histogram[-1] += 1
+
+class AdaptivePacer:
+    
+    # Replaces the fixed sleeps after a scroll. The fixed sleep time becomes the
+    # upper bound, and the wait ends as soon as new comment threads appear or
+    # the page height changes with no continuation spinner left, or once the
+    # page has stayed quiet for quiet_period. The bound shrinks towards
+    # latency_multiplier times the moving average of observed load latencies,
+    # kept per scroll key, as a page-down rarely loads anything while a scroll
+    # to the end waits for a continuation. A wait that runs into its bound
+    # counts as a load that took the whole bound, so the bound grows back on a
+    # slow network.
+    
+    def __init__(self, enabled: bool = True, quiet_period: float = 0.25, latency_multiplier: float = 3.0, smoothing: float = 0.3, poll_frequency: float = 0.05) -> None:
+        
+        self.enabled = enabled
+        self.quiet_period = quiet_period
+        self.latency_multiplier = latency_multiplier
+        self.smoothing = smoothing
+        self.poll_frequency = poll_frequency
+        self.estimated_latencies: Dict[str, float] = {}
+        self.number_of_waits: int = 0
+        # Waits that slept the whole fixed time, and adaptive waits that ran
+        # into their upper bound
+        self.number_of_fixed_sleeps: int = 0
+        self.number_of_timeouts: int = 0
+        self.total_fixed_sleep_time: float = 0.0
+        self.total_wait_time: float = 0.0
+        
+    def get_load_state(self, driver: WebDriver) -> Optional[List]:
+        
+        if not self.enabled:
+            return None
+        
+        return driver.execute_script(PAGE_LOAD_STATE_SCRIPT)
+        
+    def wait(self, driver: WebDriver, state_before: Optional[List], sleep_time: float, key: str) -> None:
+        
+        started: float = time.monotonic()
+        
+        if not self.enabled or state_before is None:
+            
+            time.sleep(sleep_time)
+            
+            self.number_of_fixed_sleeps += 1
+            
+        else:
+            
+            upper_bound: float = self._get_upper_bound(sleep_time, key)
+            
+            try:
+                
+                WebDriverWait(driver, upper_bound, poll_frequency=self.poll_frequency).until(
+                    lambda d: self._has_settled(d, state_before, started, key)
+                )
+                
+            except TimeoutException:
+                
+                self.number_of_timeouts += 1
+                self._update_estimated_latency(key, upper_bound)
+        
+        self._record_wait(sleep_time, time.monotonic() - started)
+        
+    async def wait_async(self, driver: WebDriver, state_before: Optional[List], sleep_time: float, key: str, run_blocking: Callable) -> None:
+        
+        # Same as wait, but sleeps between polls on the event loop and runs the
+        # polls themselves through run_blocking.
+        started: float = time.monotonic()
+        
+        if not self.enabled or state_before is None:
+            
+            await asyncio.sleep(sleep_time)
+            
+            self.number_of_fixed_sleeps += 1
+            
+        else:
+            
+            upper_bound: float = self._get_upper_bound(sleep_time, key)
+            
+            while not await run_blocking(self._has_settled, driver, state_before, started, key):
+                
+                if time.monotonic() - started >= upper_bound:
+                    
+                    self.number_of_timeouts += 1
+                    self._update_estimated_latency(key, upper_bound)
+                    
+                    break
+                
+                await asyncio.sleep(self.poll_frequency)
+                
+        self._record_wait(sleep_time, time.monotonic() - started)
+        
+    def get_saved_time(self) -> float:
+        
+        return self.total_fixed_sleep_time - self.total_wait_time
+    
+    def _get_upper_bound(self, sleep_time: float, key: str) -> float:
+        
+        if key not in self.estimated_latencies:
+            return sleep_time
+        
+        return min(sleep_time, max(self.quiet_period, self.estimated_latencies[key] * self.latency_multiplier))
+    
+    def _update_estimated_latency(self, key: str, latency: float) -> None:
+        
+        if key not in self.estimated_latencies:
+            self.estimated_latencies[key] = latency
+        else:
+            self.estimated_latencies[key] = self.smoothing * latency + (1 - self.smoothing) * self.estimated_latencies[key]
+    
+    def _record_wait(self, sleep_time: float, waited: float) -> None:
+        
+        self.number_of_waits += 1
+        self.total_fixed_sleep_time += sleep_time
+        self.total_wait_time += waited
+    
+    def log_report(self) -> None:
+        
+        logging.info(f'adaptive waits: {self.number_of_waits} waits took {self.total_wait_time:.1f}s instead of {self.total_fixed_sleep_time:.1f}s, saved {self.get_saved_time():.1f}s, {self.number_of_fixed_sleeps} fixed sleeps, {self.number_of_timeouts} timeouts')
+        
+        for key, estimated_latency in self.estimated_latencies.items():
+            logging.info(f'estimated load latency after {SCROLL_KEY_NAMES.get(key, repr(key))}: {estimated_latency:.2f}s')
+        
+    def _has_settled(self, driver: WebDriver, state_before: List, started: float, key: str) -> bool:
+        
+        height, thread_count, spinner_visible = driver.execute_script(PAGE_LOAD_STATE_SCRIPT)
+        
+        if spinner_visible:
+            return False
+        
+        elapsed: float = time.monotonic() - started
+        
+        if height != state_before[0] or thread_count != state_before[1]:
+            
+            self._update_estimated_latency(key, elapsed)
+            
+            return True
+        
+        return elapsed >= self.quiet_period
+
+class ScrollPlanner:
+    
+    # Plans scrolling from yields measured during the run instead of a fixed
+    # 20 comments per scroll to the end and 4 page-downs per scroll to the end.
+    # The comments yielded per scroll to the end is the number of comment
+    # threads rendered per scroll times the unique comments stored per rendered
+    # thread so far. The comment thread counts as exhausted once its
+    # continuation element is gone, or after patience scrolls in a row that
+    # neither grew the page nor rendered new threads while no continuation
+    # was loading (loading_patience scrolls in a row when one was).
+    
+    def __init__(self, comments_per_scroll_end: float = 20, pages_per_scroll_end: float = 4, smoothing: float = 0.3, patience: int = 3, loading_patience: int = 20) -> None:
+        
+        self.comments_per_scroll_end = comments_per_scroll_end
+        self.pages_per_scroll_end = pages_per_scroll_end
+        self.smoothing = smoothing
+        self.patience = patience
+        self.loading_patience = loading_patience
+        self.comments_per_thread: float = 1.0
+        self.count_of_rendered_threads: int = 0
+        self.number_of_scroll_ends: int = 0
+        self.exhausted: bool = False
+        self._threads_from_scroll_ends: int = 0
+        self._height: int = 0
+        self._scrolls_without_progress: int = 0
+        self._scrolls_while_loading: int = 0
+        
+    def start(self, driver: WebDriver) -> None:
+        
+        # Takes the baseline on the loaded page before the first scroll. The
+        # continuation may not be rendered yet, so this never marks the
+        # comments as exhausted.
+        height, viewport_height, number_of_new_threads, has_continuation, spinner_visible = driver.execute_script(SCROLL_PROGRESS_SCRIPT)
+        
+        self.count_of_rendered_threads += number_of_new_threads
+        self._height = max(self._height, height)
+        
+    def observe(self, driver: WebDriver, scroll_end: bool = True) -> bool:
+        
+        # Called after every scroll to the end (or, with scroll_end=False,
+        # after other scrolling). Returns False once the comments are exhausted.
+        height, viewport_height, number_of_new_threads, has_continuation, spinner_visible = driver.execute_script(SCROLL_PROGRESS_SCRIPT)
+        
+        growth: int = height - self._height
+        
+        self.count_of_rendered_threads += number_of_new_threads
+        
+        if scroll_end:
+            
+            self.number_of_scroll_ends += 1
+            self._threads_from_scroll_ends += number_of_new_threads
+            self.comments_per_scroll_end = self._threads_from_scroll_ends * self.comments_per_thread / self.number_of_scroll_ends
+            
+            if growth > 0 and self._height > 0 and viewport_height > 0:
+                self.pages_per_scroll_end = self.smoothing * (growth / viewport_height) + (1 - self.smoothing) * self.pages_per_scroll_end
+        
+        # A continuation still loading on a slow network is not the end
+        if growth > 0 or number_of_new_threads > 0:
+            
+            self._scrolls_without_progress = 0
+            self._scrolls_while_loading = 0
+            
+        elif spinner_visible:
+            
+            self._scrolls_without_progress = 0
+            self._scrolls_while_loading += 1
+            
+        else:
+            self._scrolls_without_progress += 1
+            
+        self._height = max(self._height, height)
+        
+        if not self.exhausted:
+            
+            if not has_continuation and self.count_of_rendered_threads > 0:
+                
+                logging.info('comment continuation exhausted')
+                
+                self.exhausted = True
+                
+            elif self._scrolls_without_progress >= self.patience:
+                
+                logging.info(f'no new comments after {self._scrolls_without_progress} scrolls')
+                
+                self.exhausted = True
+                
+            elif self._scrolls_while_loading >= self.loading_patience:
+                
+                logging.info(f'comment continuation still loading after {self._scrolls_while_loading} scrolls')
+                
+                self.exhausted = True
+                
+        return not self.exhausted
+    
+    def record_harvest(self, count_of_scraped_comments: int) -> None:
+        
+        if self.count_of_rendered_threads > 0 and count_of_scraped_comments > 0:
+            self.comments_per_thread = count_of_scraped_comments / self.count_of_rendered_threads
+    
+    def get_expected_comments(self) -> float:
+        
+        return self.count_of_rendered_threads * self.comments_per_thread
+    
+    def get_remaining_scroll_end_times(self, number_of_comments_to_scrape: int) -> int:
+        
+        if self.exhausted:
+            return 0
+        
+        remaining: float = number_of_comments_to_scrape - self.get_expected_comments()
+        
+        if remaining <= 0:
+            return 0
+        
+        return math.ceil(remaining / max(self.comments_per_scroll_end, 1))
+    
+    def get_page_times(self, scroll_end_count: int) -> int:
+        
+        # Page-ups or page-downs covering scroll_end_count scrolls to the end
+        return math.ceil(scroll_end_count * self.pages_per_scroll_end)
+    
+    def get_scroll_end_times_for_pages(self, page_times: int) -> int:
+        
+        return int(page_times / max(self.pages_per_scroll_end, 1))
+    
+    def log_report(self) -> None:
+        
+        logging.info(f'scroll planner: {self.comments_per_scroll_end:.1f} comments and {self.pages_per_scroll_end:.1f} pages per scroll to end, {self.comments_per_thread:.2f} comments per thread')
+        
+    def get_report(self) -> dict:
+        
+        return {
+            'scroll_ends': self.number_of_scroll_ends,
+            'rendered_threads': self.count_of_rendered_threads,
+            'comments_per_scroll_end': round(self.comments_per_scroll_end, 2),
+            'pages_per_scroll_end': round(self.pages_per_scroll_end, 2),
+            'comments_per_thread': round(self.comments_per_thread, 3),
+            'exhausted': self.exhausted
+        }
+
+class PageMemoryTrimmer:
+    
+    # Keeps the tab at a bounded footprint on long scrolls by removing comment
+    # threads once they are harvested, keeping the last keep_threads of them.
+    # When the JS heap is still above max_heap_mb after a trim, the next trims
+    # keep no harvested threads at all. Heap size and DOM node count are
+    # sampled at every trim for the run report.
+    
+    def __init__(self, enabled: bool = False, keep_threads: int = 20, max_heap_mb: Optional[float] = 512) -> None:
+        
+        self.enabled = enabled
+        self.keep_threads = keep_threads
+        self.max_heap_mb = max_heap_mb
+        self.number_of_trims: int = 0
+        self.trimmed_threads: int = 0
+        self.peak_heap_mb: Optional[float] = None
+        self.peak_dom_nodes: int = 0
+        self._over_budget: bool = False
+        
+    def trim(self, driver: WebDriver) -> None:
+        
+        if not self.enabled:
+            return
+        
+        result = driver.execute_script(TRIM_PAGE_MEMORY_SCRIPT, 0 if self._over_budget else self.keep_threads)
+        
+        self.number_of_trims += 1
+        self.trimmed_threads += result['removed']
+        self.peak_dom_nodes = max(self.peak_dom_nodes, result['dom_nodes'])
+        
+        # performance.memory only exists in Chromium based browsers
+        heap_mb: Optional[float] = None
+        
+        if result['used_heap'] is not None:
+            
+            heap_mb = result['used_heap'] / (1024 * 1024)
+            self.peak_heap_mb = heap_mb if self.peak_heap_mb is None else max(self.peak_heap_mb, heap_mb)
+            
+            if self.max_heap_mb is not None:
+                
+                over_budget: bool = heap_mb > self.max_heap_mb
+                
+                if over_budget and not self._over_budget:
+                    logging.info(f'page heap above {self.max_heap_mb} MB, trimming all harvested threads')
+                
+                self._over_budget = over_budget
+        
+        logging.info(f'trimmed threads: {result["removed"]}, remaining: {result["remaining"]}, dom nodes: {result["dom_nodes"]}, heap: {"unknown" if heap_mb is None else f"{heap_mb:.0f} MB"}')
+        
+    def get_report(self) -> dict:
+        
+        return {
+            'enabled': self.enabled,
+            'trims': self.number_of_trims,
+            'trimmed_threads': self.trimmed_threads,
+            'peak_heap_mb': None if self.peak_heap_mb is None else round(self.peak_heap_mb, 1),
+            'peak_dom_nodes': self.peak_dom_nodes
+        }
+
+class InnertubeCommentPage:
+    
+    def __init__(self, comment_records: List[Dict[str, str]], reply_continuation_tokens: List[str], next_continuation_token: Optional[str], count_of_total_comments: Optional[int] = None, sort_continuation_tokens: Optional[Dict[str, str]] = None) -> None:
+        
+        self.comment_records = comment_records
+        self.reply_continuation_tokens = reply_continuation_tokens
+        self.next_continuation_token = next_continuation_token
+        self.count_of_total_comments = count_of_total_comments
+        # Continuation tokens that reload the comments in another sort order,
+        # keyed like SORT_ORDERS. Only the first page carries them.
+        self.sort_continuation_tokens = sort_continuation_tokens if sort_continuation_tokens is not None else {}
+
+class InnertubeCommentClient:
+    
+    # Fetches comments without a browser by following the JSON continuation
+    # tokens that the watch page itself uses. The API host is taken from the
+    # video URL, so a local stub server serving recorded responses can stand in
+    # for www.youtube.com.
+    
+    def __init__(self, video_url: str, pool_size: int = 8, timeout: float = 30) -> None:
+        
+        parsed_url = urlparse(video_url)
+        
+        self.video_url = video_url
+        self.base_url = f'{parsed_url.scheme}://{parsed_url.netloc}'
+        self.pool_size = pool_size
+        self.timeout = timeout
+        self.api_key: Optional[str] = None
+        self.context: Optional[dict] = None
+        
+        retry = Retry(total=3, backoff_factor=0.5, status_forcelist=(429, 500, 502, 503, 504), allowed_methods=None)
+        adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+        
+        self.session = requests.Session()
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self.session.headers.update({
+            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/114.0.0.0 Safari/537.36 Edg/114.0.1823.43',
+            'Accept-Language': 'en-US,en;q=0.9'
+        })
+        # Skips the cookie consent interstitial served to EU visitors
+        self.session.cookies.set('SOCS', 'CAI')
+        
+    def __enter__(self) -> 'InnertubeCommentClient':
+        
+        return self
+    
+    def __exit__(self, *args) -> None:
+        
+        self.session.close()
+        
+    def get_comments_continuation_token(self) -> Optional[str]:
+        
+        response = self.session.get(self.video_url, timeout=self.timeout)
+        response.raise_for_status()
+        
+        ytcfg: dict = {}
+        
+        for config in self._extract_json_objects(response.text, r'ytcfg\.set\s*\(\s*(?=\{)'):
+            ytcfg.update(config)
+            
+        initial_data = next(iter(self._extract_json_objects(response.text, r'(?:var\s+ytInitialData|window\["ytInitialData"\])\s*=\s*(?=\{)')), None)
+        
+        if 'INNERTUBE_CONTEXT' not in ytcfg or initial_data is None:
+            raise ValueError(f'Could not find the InnerTube config in the watch page: {self.video_url}')
+        
+        self.api_key = ytcfg.get('INNERTUBE_API_KEY')
+        self.context = ytcfg.get('INNERTUBE_CONTEXT')
+        
+        for item_section in self._search_dict(initial_data, 'itemSectionRenderer'):
+            
+            if item_section.get('sectionIdentifier') != 'comment-item-section':
+                continue
+            
+            for content in item_section.get('contents', []):
+                
+                if 'continuationItemRenderer' in content:
+                    return self._get_continuation_token(content['continuationItemRenderer'])
+                
+        return None
+    
+    def get_comment_page(self, continuation_token: str) -> InnertubeCommentPage:
+        
+        response = self.session.post(
+            f'{self.base_url}/youtubei/v1/next',
+            params={'key': self.api_key, 'prettyPrint': 'false'} if self.api_key else {'prettyPrint': 'false'},
+            json={'context': self.context, 'continuation': continuation_token},
+            timeout=self.timeout
+        )
+        response.raise_for_status()
+        
+        return self._parse_comment_page(response.json())
+    
+    def get_replies(self, reply_continuation_tokens: List[str]) -> List[List[Dict[str, str]]]:
+        
+        with ThreadPoolExecutor(max_workers=self.pool_size) as executor:
+            
+            return list(executor.map(self._get_reply_thread, reply_continuation_tokens))
+    
+    def _get_reply_thread(self, continuation_token: str) -> List[Dict[str, str]]:
+        
+        reply_records: List[Dict[str, str]] = []
+        
+        while continuation_token is not None:
+            
+            page = self.get_comment_page(continuation_token)
+            
+            reply_records.extend(page.comment_records)
+            continuation_token = page.next_continuation_token
+            
+        return reply_records
+    
+    def _parse_comment_page(self, response_data: dict) -> InnertubeCommentPage:
+        
+        # Newer responses only reference comments by key from the thread and
+        # carry the comment itself in frameworkUpdates as an entity payload.
+        comment_entities: Dict[str, dict] = {}
+        
+        for mutation in response_data.get('frameworkUpdates', {}).get('entityBatchUpdate', {}).get('mutations', []):
+            
+            payload = mutation.get('payload', {})
+            
+            if 'commentEntityPayload' in payload:
+                comment_entities[mutation.get('entityKey')] = payload['commentEntityPayload']
+        
+        continuation_items: List[dict] = []
+        
+        for endpoint in response_data.get('onResponseReceivedEndpoints', []):
+            
+            for action in ('reloadContinuationItemsCommand', 'appendContinuationItemsAction'):
+                
+                continuation_items.extend(endpoint.get(action, {}).get('continuationItems', []))
+                
+        comment_records: List[Dict[str, str]] = []
+        reply_continuation_tokens: List[str] = []
+        next_continuation_token: Optional[str] = None
+        count_of_total_comments: Optional[int] = None
+        sort_continuation_tokens: Dict[str, str] = {}
+        
+        for item in continuation_items:
+            
+            if 'commentsHeaderRenderer' in item:
+                
+                count_text = self._get_text(item['commentsHeaderRenderer'].get('countText', {}))
+                count_digits = re.sub(r'[^0-9]', '', count_text)
+                
+                if count_digits:
+                    count_of_total_comments = int(count_digits)
+                    
+                sort_menu_items = item['commentsHeaderRenderer'].get('sortMenu', {}).get('sortFilterSubMenuRenderer', {}).get('subMenuItems', [])
+                
+                for sort_order, index in SORT_ORDERS.items():
+                    
+                    if index < len(sort_menu_items):
+                        
+                        token = sort_menu_items[index].get('serviceEndpoint', {}).get('continuationCommand', {}).get('token')
+                        
+                        if token is not None:
+                            sort_continuation_tokens[sort_order] = token
+                    
+            elif 'commentThreadRenderer' in item:
+                
+                thread = item['commentThreadRenderer']
+                comment_record = self._get_comment_record(thread, comment_entities)
+                
+                if comment_record is not None:
+                    comment_records.append(comment_record)
+                
+                for reply_content in thread.get('replies', {}).get('commentRepliesRenderer', {}).get('contents', []):
+                    
+                    if 'continuationItemRenderer' in reply_content:
+                        
+                        reply_continuation_token = self._get_continuation_token(reply_content['continuationItemRenderer'])
+                        
+                        if reply_continuation_token is not None:
+                            reply_continuation_tokens.append(reply_continuation_token)
+                            
+            elif 'commentRenderer' in item or 'commentViewModel' in item:
+                
+                comment_record = self._get_comment_record(item, comment_entities)
+                
+                if comment_record is not None:
+                    comment_records.append(comment_record)
+                    
+            elif 'continuationItemRenderer' in item:
+                
+                next_continuation_token = self._get_continuation_token(item['continuationItemRenderer'])
+                
+        return InnertubeCommentPage(comment_records, reply_continuation_tokens, next_continuation_token, count_of_total_comments, sort_continuation_tokens)
+    
+    def _get_comment_record(self, item: dict, comment_entities: Dict[str, dict]) -> Optional[Dict[str, str]]:
+        
+        comment_renderer = item.get('commentRenderer') or item.get('comment', {}).get('commentRenderer')
+        
+        if comment_renderer is not None:
+            
+            return {
+                'comment_id': comment_renderer.get('commentId', ''),
+                'comment_text': self._get_text(comment_renderer.get('contentText', {})),
+                'time_elapsed_since_comment': self._get_text(comment_renderer.get('publishedTimeText', {})),
+                'author': self._get_text(comment_renderer.get('authorText', {}))
+            }
+        
+        comment_view_model = item.get('commentViewModel', {})
+        comment_view_model = comment_view_model.get('commentViewModel', comment_view_model)
+        comment_entity = comment_entities.get(comment_view_model.get('commentKey'))
+        
+        if comment_entity is None:
+            return None
+        
+        properties = comment_entity.get('properties', {})
+        
+        return {
+            'comment_id': properties.get('commentId', ''),
+            'comment_text': properties.get('content', {}).get('content', ''),
+            'time_elapsed_since_comment': properties.get('publishedTime', ''),
+            'author': comment_entity.get('author', {}).get('displayName', '')
+        }
+    
+    def _get_continuation_token(self, continuation_item_renderer: dict) -> Optional[str]:
+        
+        for command_holder in (continuation_item_renderer.get('continuationEndpoint', {}), continuation_item_renderer.get('button', {}).get('buttonRenderer', {}).get('command', {})):
+            
+            token = command_holder.get('continuationCommand', {}).get('token')
+            
+            if token is not None:
+                return token
+            
+        return None
+    
+    def _get_text(self, text_data: dict) -> str:
+        
+        if 'simpleText' in text_data:
+            return text_data['simpleText']
+        
+        return ''.join(run.get('text', '') for run in text_data.get('runs', []))
+    
+    def _extract_json_objects(self, html: str, pattern: str) -> List[dict]:
+        
+        # The pattern only locates where an object literal starts, the decoder
+        # then reads exactly one JSON value from there.
+        decoder = json.JSONDecoder()
+        json_objects: List[dict] = []
+        
+        for match in re.finditer(pattern, html):
+            
+            try:
+                json_objects.append(decoder.raw_decode(html, match.end())[0])
+            except ValueError:
+                pass
+            
+        return json_objects
+    
+    def _search_dict(self, data, key: str):
+        
+        stack = [data]
+        
+        while stack:
+            
+            current = stack.pop()
+            
+            if isinstance(current, dict):
+                
+                for k, v in current.items():
+                    
+                    if k == key:
+                        yield v
+                    else:
+                        stack.append(v)
+                        
+            elif isinstance(current, list):
+                stack.extend(current)
+
+def create_driver(browser: str, driver_path: str, headless: bool = False) -> WebDriver:
+    
+    if browser == 'edge':
+        options = EdgeOptions()
+    elif browser == 'chrome':
+        options = ChromeOptions()
+    else:
+        raise ValueError(f'Browser does not exist: {browser}')
+    
+    if headless:
+        
+        options.add_argument('--headless=new')
+        options.add_argument('--window-size=1920,1080')
+        # Needed for Chrome/Chromium in containers and on most Linux servers
+        options.add_argument('--no-sandbox')
+        options.add_argument('--disable-dev-shm-usage')
+        
+    if browser == 'edge':
+        return Edge(executable_path=driver_path, options=options)
+    
+    return Chrome(executable_path=driver_path, options=options)
+
+class BrowserSessionPool:
+    
+    # Keeps warmed browser sessions (YouTube bootstrap cached, consent cookie
+    # set) and lends them to scrapers. Between videos a session gets a clean
+    # tab, and it is recycled after max_videos_per_session videos, once its tab
+    # heap passes max_heap_mb, or when the scrape using it failed.
+    
+    def __init__(self, browser: str, driver_path: str, size: int = 1, headless: bool = True, max_videos_per_session: int = 10, max_heap_mb: Optional[int] = 1024, warm_url: str = 'https://www.youtube.com') -> None:
+        
+        self.browser = browser
+        self.driver_path = driver_path
+        self.size = size
+        self.headless = headless
+        self.max_videos_per_session = max_videos_per_session
+        self.max_heap_mb = max_heap_mb
+        self.warm_url = warm_url
+        self._idle_sessions: queue.Queue = queue.Queue()
+        self._available = threading.Semaphore(size)
+        self._videos_per_session: Dict[str, int] = {}
+        self._lock = threading.Lock()
+        
+    def __enter__(self) -> 'BrowserSessionPool':
+        
+        return self
+    
+    def __exit__(self, *args) -> None:
+        
+        self.close()
+        
+    def acquire(self, timeout: Optional[float] = None) -> WebDriver:
+        
+        if not self._available.acquire(timeout=timeout):
+            raise TimeoutError('No browser session became available')
+        
+        try:
+            
+            return self._idle_sessions.get_nowait()
+        
+        except queue.Empty:
+            
+            try:
+                return self._start_session()
+            except:
+                self._available.release()
+                raise
+            
+    def release(self, driver: WebDriver, healthy: bool = True) -> None:
+        
+        try:
+            
+            with self._lock:
+                self._videos_per_session[driver.session_id] = self._videos_per_session.get(driver.session_id, 0) + 1
+            
+            if healthy and not self._needs_recycling(driver):
+                
+                self._reset_tab_state(driver)
+                self._idle_sessions.put(driver)
+                
+            else:
+                self._quit_session(driver)
+                
+        except Exception as e:
+            
+            logging.info(f'Browser session could not be reset, recycling it: {e!r}')
+            
+            self._quit_session(driver)
+            
+        finally:
+            self._available.release()
+            
+    def close(self) -> None:
+        
+        while True:
+            
+            try:
+                self._quit_session(self._idle_sessions.get_nowait())
+            except queue.Empty:
+                break
+            
+    def _start_session(self) -> WebDriver:
+        
+        driver = create_driver(self.browser, self.driver_path, self.headless)
+        
+        try:
+            
+            driver.get(self.warm_url)
+            
+            # EU visitors get a consent page first
+            try:
+                WebDriverWait(driver, 5).until(EC.element_to_be_clickable((By.CSS_SELECTOR, 'form[action*="consent"] button, button[aria-label^="Accept"]'))).click()
+            except TimeoutException:
+                pass
+            
+            driver.add_cookie({'name': 'SOCS', 'value': 'CAI'})
+            
+        except Exception as e:
+            
+            logging.info(f'Warming up the browser session failed: {e!r}')
+            
+        logging.info(f'Started browser session: {driver.session_id}')
+            
+        return driver
+    
+    def _needs_recycling(self, driver: WebDriver) -> bool:
+        
+        if self._videos_per_session[driver.session_id] >= self.max_videos_per_session:
+            
+            logging.info(f'Recycling browser session after {self._videos_per_session[driver.session_id]} videos')
+            
+            return True
+        
+        if self.max_heap_mb is not None:
+            
+            # performance.memory is only available in Chromium based browsers
+            used_heap = driver.execute_script('return window.performance.memory ? window.performance.memory.usedJSHeapSize : null')
+            
+            if used_heap is not None and used_heap / (1024 * 1024) > self.max_heap_mb:
+                
+                logging.info(f'Recycling browser session with a {used_heap / (1024 * 1024):.0f} MB heap')
+                
+                return True
+            
+        return False
+    
+    def _reset_tab_state(self, driver: WebDriver) -> None:
+        
+        # Cookies and the HTTP cache are kept, they are what makes the session warm
+        window_handles = driver.window_handles
+        
+        for window_handle in window_handles[1:]:
+            
+            driver.switch_to.window(window_handle)
+            driver.close()
+            
+        driver.switch_to.window(window_handles[0])
+        driver.get('about:blank')
+        
+    def _quit_session(self, driver: WebDriver) -> None:
+        
+        with self._lock:
+            self._videos_per_session.pop(driver.session_id, None)
+        
+        try:
+            driver.quit()
+        except Exception:
+            pass
+
+class YoutubeCommentScraper:
+
+    # edge_driver_path is the path to msedgedriver, or to chromedriver with
+    # browser='chrome'. With a browser_session_pool, sessions are borrowed
+    # from the pool instead of being launched for every scrape.
+    
+    def __init__(self, edge_driver_path: str, video_title: str, video_url: str, tags: Optional[str] = None, headless: bool = False, browser: str = 'edge', browser_session_pool: Optional['BrowserSessionPool'] = None) -> None:
+        
+        self.edge_driver_path = edge_driver_path
+        self.video_title = video_title
+        self.video_url = video_url
+        self.tags = tags
+        self.headless = headless
+        self.browser = browser
+        self.browser_session_pool = browser_session_pool
+        self.scraped_youtube_comments = YoutubeCommentBatch(from_video=video_title, tags=tags)
+        self.count_of_total_comments: int = 0
+        self.count_of_scraped_comments: int = 0
+        self._comment_sink: Optional[CommentSink] = None
+        self._checkpoint: Optional[ScrapeCheckpoint] = None
+        self._dedup_index = CommentDedupIndex()
+        self._count_of_durable_comments: int = 0
+        self._sink_offset: int = 0
+        self._comment_store: Optional[CommentStore] = None
+        self._pending_comment_store_records: List[Dict[str, str]] = []
+        self._incremental: bool = False
+        self._known_comments_to_stop: Optional[int] = 20
+        self._count_of_consecutive_known: int = 0
+        self._reached_known_comments: bool = False
+        self._target_cut_batch: bool = False
+        self._pacer = AdaptivePacer()
+        self._page_memory_trimmer = PageMemoryTrimmer()
+        self._scroll_planner = ScrollPlanner()
+        self._shard_scroll_planners: Dict[str, ScrollPlanner] = {}
+        self._body_elements: Dict[str, WebElement] = {}
+        self._store_lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.metrics = ScrapeMetrics()
+
+    def scrape_comments(self, number_of_comments_to_scrape: int, scrape_method: str = 'simple', scrape_replies: bool = False, adaptive_waits: bool = True, comment_sink: Optional[CommentSink] = None, checkpoint_path: Optional[str] = None, resume: bool = False, dedup_index_path: Optional[str] = None, record_command_latency: bool = False, report_path: Optional[str] = None, metrics_exporter: Optional[Callable[[dict], None]] = None, trim_page_memory: bool = False, sort_orders: Tuple[str, ...] = ('top',), reply_tabs: int = 0, comment_store_path: Optional[str] = None, incremental: bool = False, known_comments_to_stop: int = 20) -> None:
+        
+        coroutine = self.scrape_comments_async(number_of_comments_to_scrape, scrape_method, scrape_replies, adaptive_waits, comment_sink, checkpoint_path, resume, dedup_index_path, record_command_latency, report_path, metrics_exporter, trim_page_memory, sort_orders, reply_tabs, comment_store_path, incremental, known_comments_to_stop)
+        
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            
+            asyncio.run(coroutine)
+            
+            return
+        
+        # Called from a thread with a running event loop (e.g. a notebook),
+        # where asyncio.run is not allowed, so the scrape gets a loop of its
+        # own on a worker thread.
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            executor.submit(asyncio.run, coroutine).result()
+        
+    async def scrape_comments_async(self, number_of_comments_to_scrape: int, scrape_method: str = 'simple', scrape_replies: bool = False, adaptive_waits: bool = True, comment_sink: Optional[CommentSink] = None, checkpoint_path: Optional[str] = None, resume: bool = False, dedup_index_path: Optional[str] = None, record_command_latency: bool = False, report_path: Optional[str] = None, metrics_exporter: Optional[Callable[[dict], None]] = None, trim_page_memory: bool = False, sort_orders: Tuple[str, ...] = ('top',), reply_tabs: int = 0, comment_store_path: Optional[str] = None, incremental: bool = False, known_comments_to_stop: int = 20, executor: Optional[ThreadPoolExecutor] = None) -> None:
+        
+        time_of_collection: str = date.today().strftime('%Y-%m-%d')
+        
+        if self.count_of_scraped_comments > 0:
+            
+            logging.info('You must clear comments before you can scrape comments')
+            
+            return
+        
+        # With a sink, comments are written out as they are stored and
+        # scraped_youtube_comments stays empty.
+        self._comment_sink = comment_sink
+        self._pacer = AdaptivePacer(enabled=adaptive_waits)
+        # Trimming frees the DOM of harvested threads during the batched,
+        # expensive and streaming methods; simple harvests only once at the end.
+        self._page_memory_trimmer = PageMemoryTrimmer(enabled=trim_page_memory)
+        self._scroll_planner = ScrollPlanner()
+        # Sharded streaming plans every sort order tab with its own planner
+        self._shard_scroll_planners = {}
+        self.metrics = ScrapeMetrics(record_command_latency)
+        # A dedup index path keeps the comment hashes on disk, so comments
+        # collected by earlier runs of the same video are skipped too.
+        self._dedup_index = CommentDedupIndex(dedup_index_path)
+        # Stored comments that are on disk in the sink or the checkpoint; the
+        # dedup index file only takes their digests
+        self._count_of_durable_comments = 0
+        self._sink_offset = comment_sink.count_of_written_comments if comment_sink is not None else 0
+        self._checkpoint = None
+        
+        # With a comment store, every collected comment is merged into it. In
+        # incremental mode, comments are scraped newest first, comments already
+        # in the store are left out, and scraping stops after
+        # known_comments_to_stop known top-level comments in a row.
+        self._comment_store = CommentStore(comment_store_path) if comment_store_path is not None else None
+        self._pending_comment_store_records = []
+        self._incremental = incremental and self._comment_store is not None
+        self._known_comments_to_stop = known_comments_to_stop
+        self._count_of_consecutive_known = 0
+        self._reached_known_comments = False
+        self._target_cut_batch = False
+        
+        if incremental and self._comment_store is None:
+            logging.info('Incremental mode needs a comment store, scraping everything')
+            
+        if self._incremental and scrape_method not in ('streaming', 'innertube'):
+            
+            logging.info('Incremental mode needs the streaming or innertube method, scraping everything')
+            
+            self._incremental = False
+            
+        if self._incremental and scrape_method == 'streaming':
+            sort_orders = ('newest',)
+            
+        # The streaming method runs on the event loop, with every WebDriver
+        # call in the executor and the waits between calls as asyncio sleeps,
+        # so one process can multiplex many sessions. The other methods run as
+        # a whole in the executor. Without an executor, a small one is created
+        # for this scrape.
+        own_executor: bool = executor is None
+        self._executor = ThreadPoolExecutor(max_workers=4) if own_executor else executor
+        
+        resumed_state: dict = {}
+        finished: bool = False
+        # Whether the video has no comments left to scrape, as opposed to the
+        # run stopping at its target
+        exhausted: bool = False
+        
+        if checkpoint_path is not None:
+            
+            self._checkpoint = ScrapeCheckpoint(checkpoint_path)
+            
+            if resume:
+                resumed_state = await self._run_blocking(self._restore_checkpoint, scrape_method, time_of_collection)
+                
+            self._checkpoint.open(scrape_method, resume)
+            
+        resumed_position: dict = resumed_state.get('position', {})
+            
+        try:
+            
+            if resumed_state.get('finished'):
+                
+                logging.info('Scraping was already finished according to the checkpoint')
+                
+                exhausted = True
+                
+            elif scrape_method == 'innertube':
+                
+                logging.info('Scrape method starts: innertube')
+                
+                exhausted = await self._run_blocking(self._scrape_comments_from_innertube, number_of_comments_to_scrape, scrape_replies, time_of_collection, resumed_position, 'newest' if self._incremental else 'top')
+                
+            elif scrape_method == 'streaming' and (len(sort_orders) > 1 or reply_tabs > 0):
+                
+                logging.info(f'Scrape method starts: streaming, sort orders: {", ".join(sort_orders)}, reply tabs: {reply_tabs}')
+                
+                exhausted = await self._run_blocking(self._scrape_comments_with_tabs, number_of_comments_to_scrape, scrape_replies, tuple(sort_orders), reply_tabs, time_of_collection, resumed_position)
+                
+            elif scrape_method == 'streaming':
+                
+                exhausted = await self._scrape_comments_streaming_async(number_of_comments_to_scrape, scrape_replies, time_of_collection, resumed_position, sort_orders[0])
+                
+            else:
+                
+                if tuple(sort_orders) != ('top',) or reply_tabs > 0:
+                    logging.info('Sort orders and reply tabs are only used by the streaming method')
+                
+                exhausted = await self._run_blocking(self._scrape_comments_with_browser, number_of_comments_to_scrape, scrape_method, scrape_replies, time_of_collection, resumed_position)
+                
+            finished = True
+            
+        finally:
+            
+            # Also runs when the driver crashes, so whatever was harvested so far
+            # is on disk for the next resume=True run.
+            if self._checkpoint is not None:
+                
+                # The rest of a batch cut short by the target is still to collect
+                self._checkpoint.close(exhausted and not self._target_cut_batch)
+                self._count_of_durable_comments = self.count_of_scraped_comments
+                
+            elif self._comment_sink is None and finished:
+                # The caller saves the comments of a finished run
+                self._count_of_durable_comments = self.count_of_scraped_comments
+                
+            # Through the executor, as a queued sink hands its chunk over to a
+            # writer on the event loop
+            if self._comment_sink is not None:
+                await self._run_blocking(self._comment_sink.flush)
+                
+            self._persist_durable_comments(time_of_collection)
+            self._dedup_index.close()
+            
+            if own_executor:
+                self._executor.shutdown(wait=False)
+            
+            if self._comment_store is not None:
+                
+                self.metrics.details['comment_store'] = {
+                    'path': self._comment_store.path,
+                    'incremental': self._incremental,
+                    'reached_known_comments': self._reached_known_comments,
+                    'count_of_stored_comments': len(self._comment_store)
+                }
+                
+                self._comment_store.close()
+            
+            # The run report is written for failed runs too, and the exporter
+            # (e.g. a push to a metrics backend) gets the same dictionary.
+            self.metrics.finish()
+            self.metrics.details.update({
+                'video_title': self.video_title,
+                'video_url': self.video_url,
+                'scrape_method': scrape_method,
+                'finished': finished,
+                'exhausted': exhausted,
+                'count_of_total_comments': self.count_of_total_comments,
+                'count_of_scraped_comments': self.count_of_scraped_comments
+            })
+            
+            # The innertube method never opens a browser
+            if scrape_method != 'innertube':
+                
+                self.metrics.details.update({
+                    'adaptive_waits': {
+                        'waits': self._pacer.number_of_waits,
+                        'fixed_sleeps': self._pacer.number_of_fixed_sleeps,
+                        'timeouts': self._pacer.number_of_timeouts,
+                        'wait_seconds': round(self._pacer.total_wait_time, 3),
+                        'fixed_sleep_seconds': round(self._pacer.total_fixed_sleep_time, 3),
+                        'saved_seconds': round(self._pacer.get_saved_time(), 3)
+                    },
+                    'page_memory': self._page_memory_trimmer.get_report(),
+                    'scroll_planner': {sort_order: scroll_planner.get_report() for sort_order, scroll_planner in self._shard_scroll_planners.items()} if self._shard_scroll_planners else self._scroll_planner.get_report()
+                })
+            
+            if report_path is not None:
+                self.metrics.save_report(report_path)
+                
+            if metrics_exporter is not None:
+                
+                try:
+                    metrics_exporter(self.metrics.get_report())
+                except Exception as e:
+                    logging.info(f'Metrics exporter failed: {e!r}')
+                
+    def _scrape_comments_with_browser(self, number_of_comments_to_scrape: int, scrape_method: str, scrape_replies: bool, time_of_collection: str, resumed_position: dict) -> bool:
+        
+        # Returns whether the comments were exhausted
+        
+        with self.metrics.phase('page_load'):
+            driver = self._acquire_driver()
+            
+        healthy: bool = False
+
+        try:
+            
+            self.metrics.instrument_driver(driver)
+            
+            self.count_of_total_comments = self._load_watch_page(driver, self.video_url)
+            
+            # The scrolling target; the total count includes replies, so it is
+            # only an upper bound for what the page can yield.
+            target: int = min(self.count_of_total_comments, number_of_comments_to_scrape)
+            
+            self._scroll_planner.start(driver)
+            
+            logging.info(f'Times to scroll end (estimated): {self._scroll_planner.get_remaining_scroll_end_times(target)}')
+            
+            if scrape_method not in ('simple', 'batched', 'expensive', 'streaming', 'innertube'):
+                
+                logging.info(f'Scrape method does not exist: {scrape_method}')
+                
+            elif scrape_method == 'simple':
+                
+                logging.info('Scrape method starts: simple')
+                
+                scroll_end_count: int = 0
+                
+                scroll_down_times = int
+                
+                logging.info('Started scrolling end...')             
+                
+                while self._scroll_planner.get_remaining_scroll_end_times(target) > 0:
+                
+                    self._scroll_end(driver, 3)
+                    scroll_end_count += 1
+                    
+                    if not self._scroll_planner.observe(driver):
+                        
+                        logging.info('Scrolling ends due to reaching end...')
+                        
+                        break
+                    
+                logging.info(f'Scroll end count: {scroll_end_count}')
+                        
+                if scrape_replies:
+                    
+                    self._click_to_see_replies(driver)
+                    self._click_to_see_more_replies(driver)                
+                    
+                self._click_to_read_more(driver)
+                
+                if scrape_replies:
+                    
+                    scroll_down_times = self._scroll_planner.get_page_times(scroll_end_count) + 11
+                    
+                    logging.info('Started scrolling top...')
+                    
+                    self._scroll_top(driver, 1)
+                    
+                    logging.info('Started scrolling down...')
+                    
+                    for i in range(scroll_down_times):
+                        
+                        self._scroll_down(driver, 1.5)
+                        
+                logging.info(f'Scroll down times: {scroll_down_times}')
+                
+                self._store_new_comment_records(self._get_comment_data(driver), time_of_collection, {'scroll_end_count': scroll_end_count}, number_of_comments_to_scrape)
+                    
+            elif scrape_method == 'batched':
+                
+                logging.info('Scrape method starts: batched')
+                
+                scroll_end_count: int = self._fast_forward(driver, resumed_position.get('scroll_end_count', 0))
+                completed_batches: int = resumed_position.get('completed_batches', 0)
+                reached_end: bool = False
+                
+                scroll_up_times = int
+    
+                # Batches continue until enough unique comments are stored, so a
+                # batch that lost comments to recycling is made up for by the next.
+                while not reached_end and self.count_of_scraped_comments < target:
+                    
+                    logging.info('Entered batch...')
+                    
+                    scroll_end_count_inner_loop: int = 0
+                    
+                    logging.info('Started scrolling end...')
+                    
+                    for j in range(80):
+                        
+                        if self._scroll_planner.get_remaining_scroll_end_times(target) <= 0:
+                            break
+                    
+                        self._scroll_end(driver, 3)
+                        scroll_end_count_inner_loop += 1  
+                        
+                        if not self._scroll_planner.observe(driver):
+                            
+                            logging.info('Scrolling ends due to reaching end...')
+                            
+                            break
+                        
+                    # A batch that could not scroll any further is the last one;
+                    # its rendered comments are still harvested below.
+                    reached_end = self._scroll_planner.exhausted or scroll_end_count_inner_loop == 0
+                        
+                    logging.info(f'scroll_end_count_inner_loop: {scroll_end_count_inner_loop}')
+                        
+                    if scrape_replies:
+                        
+                        self._click_to_see_replies(driver)
+                        self._click_to_see_more_replies(driver)
+                        
+                    self._click_to_read_more(driver)
+                    
+                    if scrape_replies:
+                        
+                        scroll_up_times = self._scroll_planner.get_page_times(scroll_end_count_inner_loop)
+                        
+                        logging.info('Started scrolling up...')
+                        
+                        for i in range(scroll_up_times):
+                            
+                            self._scroll_up(driver, 1.5)
+                    
+                    scroll_end_count += scroll_end_count_inner_loop
+                    completed_batches += 1
+                    
+                    self._store_new_comment_records(self._get_comment_data(driver, only_new=self._page_memory_trimmer.enabled), time_of_collection, {'scroll_end_count': scroll_end_count, 'completed_batches': completed_batches}, number_of_comments_to_scrape)
+                    self._trim_page_memory(driver)
+                    
+            elif scrape_method == 'expensive':
+                
+                logging.info('Scrape method starts: expensive')
+                
+                scroll_down_count: int = resumed_position.get('scroll_down_count', 0)
+                
+                unit: int = 200
+                flag: int = 1
+                aggressive_scrolling_up_buffer: int = 20
+                
+                if scroll_down_count > 0:
+                    
+                    self._fast_forward(driver, self._scroll_planner.get_scroll_end_times_for_pages(scroll_down_count))
+                    flag = 2
+                
+                # Harvests at least once, so comments rendered with the page are
+                # stored even when the continuation is already exhausted.
+                while self.count_of_scraped_comments < target:
+                    
+                    logging.info('Started scrolling down...')
+                    for i in range(unit * flag):                     
+                        
+                        self._scroll_down(driver, 1)
+                        
+                    self._scroll_planner.observe(driver, scroll_end=False)
+                    
+                    if scrape_replies:
+                            
+                        self._click_to_see_replies(driver)
+                        self._click_to_see_more_replies(driver)
+                        
+                    self._click_to_read_more(driver)
+                    
+                    logging.info('Started scrolling up...')
+                    for i in range(unit + aggressive_scrolling_up_buffer):                        
+                        
+                        self._scroll_up(driver, 1.5)
+                        
+                    scroll_down_count += unit
+                    flag = 2
+                    
+                    self._store_new_comment_records(self._get_comment_data(driver, only_new=self._page_memory_trimmer.enabled), time_of_collection, {'scroll_down_count': scroll_down_count}, number_of_comments_to_scrape)
+                    self._trim_page_memory(driver)
+                    
+                    if self._scroll_planner.exhausted:
+                        break
+                    
+                logging.info(f'Scroll down count: {scroll_down_count}')
+                    
+            self._pacer.log_report()
+            self._scroll_planner.log_report()
+            
+            healthy = True
+            
+        finally:
+            
+            self._body_elements.pop(driver.session_id, None)
+            self._release_driver(driver, healthy)
+            
+        return self._scroll_planner.exhausted
+
+    async def _scrape_comments_streaming_async(self, number_of_comments_to_scrape: int, scrape_replies: bool, time_of_collection: str, resumed_position: dict, sort_order: str = 'top') -> bool:
+        
+        # The streaming method of _scrape_comments_with_browser, with the
+        # WebDriver calls in the executor and the waits on the event loop. An
+        # incremental scrape streams in the newest first order and stops at
+        # known comments.
+        if sort_order not in SORT_ORDERS:
+            raise ValueError(f'Unknown sort order: {sort_order}')
+        
+        logging.info(f'Scrape method starts: streaming, sort order: {sort_order}')
+        
+        with self.metrics.phase('page_load'):
+            driver = await self._run_blocking(self._acquire_driver)
+            
+        healthy: bool = False
+        
+        try:
+            
+            self.metrics.instrument_driver(driver)
+            
+            self.count_of_total_comments = await self._run_blocking(self._load_watch_page, driver, self.video_url)
+            
+            await self._run_blocking(self._select_sort_order, driver, sort_order)
+            
+            # The scrolling target, as in _scrape_comments_with_browser
+            target: int = min(self.count_of_total_comments, number_of_comments_to_scrape)
+            
+            await self._run_blocking(self._scroll_planner.start, driver)
+            
+            scroll_end_count: int = await self._run_blocking(self._fast_forward, driver, resumed_position.get('scroll_end_count', 0))
+            
+            logging.info('Started scrolling end...')
+            
+            # Harvests at least once, so comments rendered with the page are
+            # stored even when the continuation is already exhausted.
+            while self.count_of_scraped_comments < target and not self._reached_known_comments:
+                
+                await self._scroll_end_async(driver, 3)
+                scroll_end_count += 1
+                
+                # Threads rendered by the last scroll are still harvested
+                # before the loop ends on an exhausted continuation.
+                await self._run_blocking(self._scroll_planner.observe, driver)
+                
+                if scrape_replies:
+                    
+                    await self._run_blocking(self._click_to_see_replies, driver, True)
+                    await self._run_blocking(self._click_to_see_more_replies, driver, True)
+                    
+                await self._run_blocking(self._click_to_read_more, driver, True)
+                
+                comment_records = await self._run_blocking(self._get_comment_data, driver, True)
+                
+                await self._run_blocking(self._store_new_comment_records, comment_records, time_of_collection, {'scroll_end_count': scroll_end_count}, number_of_comments_to_scrape)
+                await self._run_blocking(self._trim_page_memory, driver)
+                
+                if self._scroll_planner.exhausted:
+                    
+                    logging.info('Scrolling ends due to reaching end...')
+                    
+                    break
+                
+            logging.info(f'Scroll end count: {scroll_end_count}')
+            
+            self._pacer.log_report()
+            self._scroll_planner.log_report()
+            
+            healthy = True
+            
+        finally:
+            
+            self._body_elements.pop(driver.session_id, None)
+            await self._run_blocking(self._release_driver, driver, healthy)
+            
+        return self._scroll_planner.exhausted
+            
+    def _scrape_comments_with_tabs(self, number_of_comments_to_scrape: int, scrape_replies: bool, sort_orders: Tuple[str, ...], reply_tabs: int, time_of_collection: str, resumed_position: dict) -> bool:
+        
+        # Splits one video across browser sessions: one tab streams each sort
+        # order, and with reply_tabs the sort order tabs leave reply threads
+        # unexpanded and queue them for reply tabs, which open each thread's
+        # permalink and expand it on their own. Everything is stored through
+        # the shared dedup index, so comments seen by several tabs count once.
+        for sort_order in sort_orders:
+            
+            if sort_order not in SORT_ORDERS:
+                raise ValueError(f'Unknown sort order: {sort_order}')
+            
+        number_of_tabs: int = len(sort_orders) + (reply_tabs if scrape_replies else 0)
+        
+        if self.browser_session_pool is not None and self.browser_session_pool.size < number_of_tabs:
+            raise ValueError(f'Browser session pool of size {self.browser_session_pool.size} is too small for {number_of_tabs} tabs')
+        
+        stop_event = threading.Event()
+        reply_thread_queue: Optional[queue.Queue] = queue.Queue() if scrape_replies and reply_tabs > 0 else None
+        shard_positions: Dict[str, dict] = dict(resumed_position.get('shards', {}))
+        
+        drivers: List[WebDriver] = []
+        healthy: Dict[str, bool] = {}
+        
+        def run_shard(driver: WebDriver, sort_order: str) -> None:
+            
+            self._scrape_sort_order_shard(driver, sort_order, number_of_comments_to_scrape, scrape_replies, reply_thread_queue, shard_positions, stop_event, time_of_collection)
+            healthy[driver.session_id] = True
+            
+        def run_reply_tab(driver: WebDriver) -> None:
+            
+            self._expand_reply_threads(driver, reply_thread_queue, number_of_comments_to_scrape, shard_positions, stop_event, time_of_collection)
+            healthy[driver.session_id] = True
+            
+        try:
+            
+            # Acquired inside the try, so the sessions already acquired are
+            # released when a later one fails to start.
+            with self.metrics.phase('page_load'):
+                
+                for i in range(number_of_tabs):
+                    
+                    driver = self._acquire_driver()
+                    
+                    drivers.append(driver)
+                    healthy[driver.session_id] = False
+            
+            for driver in drivers:
+                self.metrics.instrument_driver(driver)
+            
+            with ThreadPoolExecutor(max_workers=number_of_tabs) as executor:
+                
+                shard_futures: List[Future] = [executor.submit(run_shard, driver, sort_order) for driver, sort_order in zip(drivers, sort_orders)]
+                reply_futures: List[Future] = [executor.submit(run_reply_tab, driver) for driver in drivers[len(sort_orders):]]
+                
+                try:
+                    
+                    for future in shard_futures:
+                        future.result()
+                        
+                finally:
+                    
+                    # Reply tabs drain what is queued, then stop at the sentinels.
+                    # A failed sort order tab stops all tabs.
+                    if any(future.exception() is not None for future in shard_futures if future.done()):
+                        stop_event.set()
+                    
+                    for i in range(len(reply_futures)):
+                        reply_thread_queue.put(None)
+                        
+                for future in reply_futures:
+                    future.result()
+                    
+            self._pacer.log_report()
+                    
+        finally:
+            
+            stop_event.set()
+            
+            for driver in drivers:
+                
+                self._body_elements.pop(driver.session_id, None)
+                self._release_driver(driver, healthy[driver.session_id])
+                
+        # Every sort order holds all top-level comments, so one exhausted tab
+        # means all were seen; queued reply threads are dropped only once the
+        # target is reached.
+        return any(scroll_planner.exhausted for scroll_planner in self._shard_scroll_planners.values())
+                
+    def _scrape_sort_order_shard(self, driver: WebDriver, sort_order: str, number_of_comments_to_scrape: int, scrape_replies: bool, reply_thread_queue: Optional[queue.Queue], shard_positions: Dict[str, dict], stop_event: threading.Event, time_of_collection: str) -> None:
+        
+        scroll_planner = ScrollPlanner()
+        count_of_shard_comments: int = 0
+        
+        with self._store_lock:
+            self._shard_scroll_planners[sort_order] = scroll_planner
+        
+        self.count_of_total_comments = self._load_watch_page(driver, self.video_url)
+        self._select_sort_order(driver, sort_order)
+        
+        # The scrolling target, as in _scrape_comments_with_browser
+        target: int = min(self.count_of_total_comments, number_of_comments_to_scrape)
+        
+        scroll_planner.start(driver)
+        
+        scroll_end_count: int = self._fast_forward(driver, shard_positions.get(sort_order, {}).get('scroll_end_count', 0), scroll_planner)
+        
+        logging.info(f'Started scrolling end ({sort_order})...')
+        
+        # Harvests at least once before stopping on an exhausted continuation,
+        # as the streaming method does.
+        while self.count_of_scraped_comments < target and not stop_event.is_set() and not self._reached_known_comments:
+            
+            self._scroll_end(driver, 3)
+            scroll_end_count += 1
+            
+            scroll_planner.observe(driver)
+            
+            if scrape_replies and reply_thread_queue is None:
+                
+                self._click_to_see_replies(driver, only_new=True)
+                self._click_to_see_more_replies(driver, only_new=True)
+                
+            self._click_to_read_more(driver, only_new=True)
+            
+            comment_records = self._get_comment_data(driver, only_new=True)
+            
+            with self._store_lock:
+                shard_positions[sort_order] = {'scroll_end_count': scroll_end_count}
+                
+            self._store_new_comment_records(comment_records, time_of_collection, {'shards': dict(shard_positions)}, number_of_comments_to_scrape)
+            
+            # The tab's own yield per thread, counting comments that another
+            # tab stored first as well
+            count_of_shard_comments += len(comment_records)
+            scroll_planner.record_harvest(count_of_shard_comments)
+            
+            if reply_thread_queue is not None:
+                
+                for comment_id in driver.execute_script(REPLY_THREAD_IDS_SCRIPT):
+                    reply_thread_queue.put(comment_id)
+                    
+            self._trim_page_memory(driver)
+            
+            if scroll_planner.exhausted:
+                break
+            
+        logging.info(f'Scroll end count ({sort_order}): {scroll_end_count}')
+        
+        scroll_planner.log_report()
+        
+    def _expand_reply_threads(self, driver: WebDriver, reply_thread_queue: queue.Queue, number_of_comments_to_scrape: int, shard_positions: Dict[str, dict], stop_event: threading.Event, time_of_collection: str) -> None:
+        
+        separator: str = '&' if '?' in self.video_url else '?'
+        
+        while True:
+            
+            comment_id: Optional[str] = reply_thread_queue.get()
+            
+            if comment_id is None:
+                break
+            
+            # Queued threads are dropped once the target is reached
+            if stop_event.is_set() or self.count_of_scraped_comments >= number_of_comments_to_scrape:
+                continue
+            
+            self._load_watch_page(driver, f'{self.video_url}{separator}lc={comment_id}')
+            
+            try:
+                
+                with self.metrics.phase('page_load'):
+                    WebDriverWait(driver, 10).until(lambda d: d.execute_script(REPLY_TARGET_SCRIPT, comment_id))
+                    
+            except TimeoutException:
+                
+                logging.info(f'reply thread not found: {comment_id}')
+                
+                continue
+            
+            self._click_to_see_replies(driver, only_new=True)
+            
+            # Long reply threads load in pages, each behind another button
+            for i in range(100):
+                
+                if self._click_to_see_more_replies(driver, only_new=True) == 0:
+                    break
+                
+            self._click_to_read_more(driver, only_new=True)
+            
+            comment_records = [r for r in self._get_comment_data(driver, only_new=True) if r['comment_id'] == comment_id or r['comment_id'].startswith(comment_id + '.')]
+            
+            self.metrics.count('reply_threads')
+            
+            self._store_new_comment_records(comment_records, time_of_collection, {'shards': dict(shard_positions)}, number_of_comments_to_scrape)
+            
+    def _select_sort_order(self, driver: WebDriver, sort_order: str) -> None:
+        
+        # Comments load sorted by top comments
+        if sort_order == 'top':
+            return
+        
+        with self.metrics.phase('page_load'):
+            
+            first_thread = WebDriverWait(driver, 30).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, 'ytd-comment-thread-renderer'))
+            )
+            
+            WebDriverWait(driver, 10).until(
+                EC.element_to_be_clickable((By.CSS_SELECTOR, 'ytd-comments yt-sort-filter-sub-menu-renderer #label'))
+            ).click()
+            
+            sort_menu_items = WebDriverWait(driver, 10).until(
+                lambda d: d.find_elements(By.CSS_SELECTOR, 'ytd-comments yt-sort-filter-sub-menu-renderer tp-yt-paper-listbox a')
+            )
+            sort_menu_items[SORT_ORDERS[sort_order]].click()
+            
+            try:
+                WebDriverWait(driver, 10).until(EC.staleness_of(first_thread))
+            except TimeoutException:
+                logging.info(f'comments did not reload after sorting by {sort_order}')
+                
+        logging.info(f'sorted comments by {sort_order}')
+
+    def _load_watch_page(self, driver: WebDriver, url: str) -> int:
+        
+        # Opens the watch page and scrolls until the comment section has loaded,
+        # returning the total number of comments shown in its header.
+        with self.metrics.phase('page_load'):
+            driver.get(url)
+        
+        while True:
+            try:
+                with self.metrics.phase('page_load'):
+                    count_of_all_youtube_comments_element = WebDriverWait(driver, 1).until(
+                        EC.presence_of_element_located((By.CSS_SELECTOR, "#count > yt-formatted-string > span:nth-child(1)"))
+                    )
+                break
+            except:
+                pass
+            
+            self._scroll_down(driver, 0.5)
+            
+        return int(count_of_all_youtube_comments_element.text.replace(',', ''))
+
+    def _fast_forward(self, driver: WebDriver, scroll_end_count: int, scroll_planner: Optional[ScrollPlanner] = None) -> int:
+        
+        # Brings a resumed run back to its checkpointed scroll position without
+        # expanding or extracting anything on the way.
+        if scroll_end_count <= 0:
+            return 0
+        
+        logging.info(f'Fast-forwarding to checkpoint: {scroll_end_count} scrolls to end')
+        
+        if scroll_planner is None:
+            scroll_planner = self._scroll_planner
+        
+        for i in range(scroll_end_count):
+            
+            self._scroll_end(driver, 3)
+            
+            if not scroll_planner.observe(driver):
+                break
+            
+        return scroll_end_count
+    
+    def _restore_checkpoint(self, scrape_method: str, time_of_collection: str) -> dict:
+        
+        # Returns the checkpoint state, or an empty one when the checkpoint was
+        # made with another scrape method.
+        
+        restored_count: int = 0
+        
+        for comment_records in self._checkpoint.load_records():
+            
+            # Records saved twice around a crash are restored once
+            comment_records = self._dedup_index.add_new(comment_records, restored=True)
+                
+            self._store_comment_records(comment_records, time_of_collection)
+            restored_count += len(comment_records)
+            
+            if self._comment_store is not None:
+                self._comment_store.merge(comment_records, time_of_collection)
+            
+        self._count_of_durable_comments = self.count_of_scraped_comments
+        self._persist_durable_comments(time_of_collection)
+            
+        state = self._checkpoint.load_state()
+        
+        logging.info(f'Restored {restored_count} comments from checkpoint')
+        
+        if state.get('scrape_method') != scrape_method:
+            
+            if state:
+                logging.info(f'Checkpoint was made with scrape method {state.get("scrape_method")}, starting from the top')
+                
+            return {}
+        
+        return state
+    
+    def _store_new_comment_records(self, comment_records: List[Dict[str, str]], time_of_collection: str, position: dict, number_of_comments_to_scrape: Optional[int] = None) -> None:
+        
+        # Tabs of a sharded scrape store concurrently, through the same
+        # dedup index, sink and checkpoint.
+        with self._store_lock:
+            
+            if self._incremental:
+                comment_records = self._filter_known_comment_records(comment_records, time_of_collection)
+            
+            limit: Optional[int] = None
+            
+            if number_of_comments_to_scrape is not None:
+                limit = max(0, number_of_comments_to_scrape - self.count_of_scraped_comments)
+            
+            with self.metrics.phase('store'):
+                new_records = self._dedup_index.add_new(comment_records, limit)
+            
+            number_of_duplicates: int = self._dedup_index.last_batch_duplicates
+            
+            # When the target cut the batch short, the checkpoint keeps the
+            # position before it, so a resumed run with a higher target reads
+            # the batch again and the dedup index drops the part stored now.
+            cut: bool = self._dedup_index.last_batch_cut
+            self._target_cut_batch = self._target_cut_batch or cut
+            
+            self.metrics.count('comments_harvested', len(new_records))
+            self.metrics.count('duplicates', number_of_duplicates)
+            
+            if comment_records:
+                logging.info(f'removed duplicates: {number_of_duplicates} of {len(comment_records)} ({number_of_duplicates / len(comment_records):.1%}), unique so far: {len(self._dedup_index)}')
+                
+            with self.metrics.phase('store'):
+                
+                self._store_comment_records(new_records, time_of_collection)
+                
+                # A saved checkpoint holds every comment stored so far
+                if self._checkpoint is not None and self._checkpoint.add(new_records, None if cut else position):
+                    self._count_of_durable_comments = self.count_of_scraped_comments
+                    
+                # Merged into the comment store once they are on disk too
+                if self._comment_store is not None:
+                    self._pending_comment_store_records.extend(new_records)
+                    
+                self._persist_durable_comments(time_of_collection)
+                    
+            self._scroll_planner.record_harvest(self.count_of_scraped_comments)
+            
+    def _persist_durable_comments(self, time_of_collection: str) -> None:
+        
+        # Stored comments reach the sink, the dedup index and the comment store
+        # in the same order, so the first count_of_written_comments of them are
+        # on disk. With a checkpoint, only what it saved counts, as a resumed
+        # run rewrites the sink from the checkpoint. Neither the dedup index nor
+        # the comment store may know a comment that a crash can still lose, or
+        # later runs would skip it for good.
+        count_of_durable_comments: int = self._count_of_durable_comments
+        
+        if self._comment_sink is not None and self._checkpoint is None:
+            count_of_durable_comments = max(count_of_durable_comments, self._comment_sink.count_of_written_comments - self._sink_offset)
+            
+        self._dedup_index.persist(count_of_durable_comments)
+        
+        # The pending records are the last ones stored
+        number_of_durable_records: int = count_of_durable_comments - (self.count_of_scraped_comments - len(self._pending_comment_store_records))
+        
+        if self._comment_store is not None and number_of_durable_records > 0:
+            
+            self._comment_store.merge(self._pending_comment_store_records[:number_of_durable_records], time_of_collection)
+            
+            del self._pending_comment_store_records[:number_of_durable_records]
+        
+    def _filter_known_comment_records(self, comment_records: List[Dict[str, str]], time_of_collection: str) -> List[Dict[str, str]]:
+        
+        # Comments arrive newest first, so a long enough run of known top-level
+        # comments means everything after it was collected by an earlier run.
+        # Replies do not count towards the run, a pinned comment or a known
+        # thread with new replies does not end it either.
+        known_keys = self._comment_store.get_known_keys(comment_records)
+        unknown_records: List[Dict[str, str]] = []
+        known_records: List[Dict[str, str]] = []
+        
+        for r in comment_records:
+            
+            is_top_level: bool = '.' not in r['comment_id']
+            
+            if CommentStore.get_comment_key(r) in known_keys:
+                
+                known_records.append(r)
+                
+                if is_top_level:
+                    self._count_of_consecutive_known += 1
+                    
+            else:
+                
+                unknown_records.append(r)
+                
+                if is_top_level:
+                    self._count_of_consecutive_known = 0
+                    
+            if self._known_comments_to_stop is not None and self._count_of_consecutive_known >= self._known_comments_to_stop and not self._reached_known_comments:
+                
+                logging.info(f'Reached {self._count_of_consecutive_known} known comments in a row, the rest was collected before')
+                
+                self._reached_known_comments = True
+                
+        # Known comments only get their last_seen date updated
+        self._comment_store.merge(known_records, time_of_collection)
+        self.metrics.count('known_comments', len(known_records))
+        
+        return unknown_records
+
+    def _store_comment_records(self, comment_records: List[Dict[str, str]], time_of_collection: str) -> None:
+        
+        if self._comment_sink is None:
+            
+            self.scraped_youtube_comments.time_of_collection = time_of_collection
+            
+            for r in comment_records:
+                self.scraped_youtube_comments.append_values(r['comment_text'], r['time_elapsed_since_comment'], r['author'], r['comment_id'] or None)
                 
-                logging.info('Scrape method starts: batched')
+        else:
+            
+            for r in comment_records:
+                self._comment_sink.write(YoutubeComment(r['comment_text'], r['time_elapsed_since_comment'], r['author'], time_of_collection, self.video_title, self.tags, r['comment_id'] or None))
                 
-                comment_text_list: List[str] = []
-                time_elapsed_since_comment_list: List[str] = []
-                author_list: List[str] = []
+        self.count_of_scraped_comments += len(comment_records)
+            
+    def _scrape_comments_from_innertube(self, number_of_comments_to_scrape: int, scrape_replies: bool, time_of_collection: str, resumed_position: dict, sort_order: str = 'top') -> bool:
+        
+        page_count: int = 0
+        # The order the comments actually come in, kept with the position
+        order: str = sort_order
+        
+        with InnertubeCommentClient(self.video_url) as client:
+            
+            with self.metrics.phase('page_load'):
+                continuation_token = client.get_comments_continuation_token()
+            
+            if 'continuation_token' in resumed_position:
                 
-                scroll_end_count: int = 0
-                reached_end: bool = False
+                continuation_token = resumed_position['continuation_token']
+                order = resumed_position.get('sort_order', 'top')
                 
-                scroll_up_times = int
-    
-                batches: int = (scroll_end_times // 80) + 1
+                logging.info('Continuing from the checkpointed continuation token')
                 
-                for i in range(batches):
-                    
-                    if reached_end == True:
-                        break
-                    
-                    logging.info('Entered batch...')
-                    
-                    scroll_end_count_inner_loop: int = 0
-                    
-                    logging.info('Started scrolling end...')
-                    
-                    for j in range(80):
+                if order != sort_order:
                     
-                        self._scroll_end(driver, 3)
-                        scroll_end_count_inner_loop += 1  
-                        
-                        new_height: int = driver.execute_script('return document.documentElement.scrollHeight')
+                    logging.info(f'The checkpointed scrape reads the comments in {order} order, continuing without stopping at known comments')
                     
-                        if new_height <= current_height:
-                            
-                            logging.info('Scrolling ends due to reaching end...')
-                            
-                            reached_end = True
-                            
-                            break
+                    self._known_comments_to_stop = None
+                
+            elif sort_order != 'top' and continuation_token is not None:
+                
+                # The first page comes sorted by top comments, its header holds
+                # the token that reloads the comments in the other order.
+                with self.metrics.phase('fetch'):
+                    first_page = client.get_comment_page(continuation_token)
                     
-                        current_height = new_height
-                        
-                    logging.info(f'scroll_end_count_inner_loop: {scroll_end_count_inner_loop}')
-                        
-                    if scrape_replies:
-                        
-                        self._click_to_see_replies(driver)
-                        self._click_to_see_more_replies(driver)
-                        
-                    self._click_to_read_more(driver)
+                if sort_order in first_page.sort_continuation_tokens:
                     
-                    if scrape_replies:
-                        
-                        scroll_up_times = self._get_scroll_up_times(scroll_end_count_inner_loop)
-                        
-                        logging.info('Started scrolling up...')
-                        
-                        for i in range(scroll_up_times):
-                            
-                            self._scroll_up(driver, 1.5)
+                    continuation_token = first_page.sort_continuation_tokens[sort_order]
                     
-                    batch_comment_text_list, batch_time_elapsed_since_comment_list, batch_author_list = self._get_comment_data(driver)
-                     
-                    comment_text_list: List[str] = comment_text_list + batch_comment_text_list
-                    time_elapsed_since_comment_list: List[str] = time_elapsed_since_comment_list + batch_time_elapsed_since_comment_list
-                    author_list: List[str] = author_list + batch_author_list
+                else:
                     
-                    scroll_end_count += scroll_end_count_inner_loop
+                    logging.info(f'Sort order {sort_order} is not offered, keeping the default order without stopping at known comments')
                     
-            elif scrape_method == 'expensive':
-                
-                logging.info('Scrape method starts: expensive')
-                
-                comment_text_list: List[str] = []
-                time_elapsed_since_comment_list: List[str] = []
-                author_list: List[str] = []
+                    # Known comments say nothing about the rest in top order
+                    self._known_comments_to_stop = None
+                    order = 'top'
+            
+            while continuation_token is not None and self.count_of_scraped_comments < number_of_comments_to_scrape and not self._reached_known_comments:
                 
-                scroll_down_times: int = self._get_scroll_down_times(scroll_end_count=scroll_end_times, scroll_down_from_top=False)
-                scroll_down_count: int = 0
-                scroll_down_count_inner: int
+                with self.metrics.phase('fetch'):
+                    page = client.get_comment_page(continuation_token)
+                    
+                page_count += 1
+                self.metrics.count('pages')
                 
-                logging.info(f'scroll_down_times: {scroll_down_times}')
+                if page.count_of_total_comments is not None:
+                    self.count_of_total_comments = page.count_of_total_comments
                 
-                unit: int = 200
-                flag: int = 1
-                aggressive_scrolling_up_buffer: int = 20
+                comment_records: List[Dict[str, str]] = list(page.comment_records)
                 
-                while scroll_down_count < scroll_down_times:
+                if scrape_replies and page.reply_continuation_tokens:
                     
-                    logging.info('Started scrolling down...')
-                    for i in range(unit * flag):                     
+                    with self.metrics.phase('fetch_replies'):
                         
-                        self._scroll_down(driver, 1)
-                    
-                    if scrape_replies:
+                        for reply_records in client.get_replies(page.reply_continuation_tokens):
+                            comment_records.extend(reply_records)
                             
-                        self._click_to_see_replies(driver)
-                        self._click_to_see_more_replies(driver)
-                        
-                    self._click_to_read_more(driver)
-                    
-                    logging.info('Started scrolling up...')
-                    for i in range(unit + aggressive_scrolling_up_buffer):                        
+                    self.metrics.count('reply_threads', len(page.reply_continuation_tokens))
                         
-                        self._scroll_up(driver, 1.5)
-                        
-                    batch_comment_text_list, batch_time_elapsed_since_comment_list, batch_author_list = self._get_comment_data(driver)
-                     
-                    comment_text_list: List[str] = comment_text_list + batch_comment_text_list
-                    time_elapsed_since_comment_list: List[str] = time_elapsed_since_comment_list + batch_time_elapsed_since_comment_list
-                    author_list: List[str] = author_list + batch_author_list
-                    
-                    scroll_down_count += unit
-                    flag = 2
-                    
-            comment_text_list, time_elapsed_since_comment_list, author_list = self._remove_duplicates(comment_text_list, time_elapsed_since_comment_list, author_list)
-            
-            for c, t, a in zip(comment_text_list, time_elapsed_since_comment_list, author_list):
+                continuation_token = page.next_continuation_token
+                
+                self._store_new_comment_records(comment_records, time_of_collection, {'continuation_token': continuation_token, 'sort_order': order}, number_of_comments_to_scrape)
                 
-                comment = YoutubeComment(c.text, t.text, a.text, time_of_collection, self.video_title, self.tags)
-                self.scraped_youtube_comments.append(comment)
+                self.metrics.count('comments_extracted', len(comment_records))
+                
+                logging.info(f'got comments this time: {len(page.comment_records)}, page: {page_count}')
+                
+        if continuation_token is None:
+            logging.info('Fetching ends due to reaching end...')
+            
+        return continuation_token is None
 
     def clear_comments(self) -> None:
         
-        self.scraped_youtube_comments: List[YoutubeComment] = []
+        self.scraped_youtube_comments = YoutubeCommentBatch(from_video=self.video_title, tags=self.tags)
         self.count_of_total_comments: int = 0
+        self.count_of_scraped_comments: int = 0
+        
+    def _acquire_driver(self) -> WebDriver:
         
-    def _get_scroll_end_times(self, count_of_total_comments: int, number_of_comments_to_scrape: int):
+        if self.browser_session_pool is not None:
+            return self.browser_session_pool.acquire()
         
-        return (min(count_of_total_comments, number_of_comments_to_scrape) // 20)
+        return create_driver(self.browser, self.edge_driver_path, self.headless)
     
-    def _get_scroll_down_times(self, scroll_end_count: int, scroll_down_from_top: bool):
+    def _release_driver(self, driver: WebDriver, healthy: bool) -> None:
+        
+        if self.browser_session_pool is not None:
+            self.browser_session_pool.release(driver, healthy)
+        else:
+            driver.quit()
+        
+    def _scroll_down(self, driver: WebDriver, sleep_time: float) -> None:
+        
+        self._send_key_to_body(driver, Keys.PAGE_DOWN, sleep_time)
+
+    def _scroll_up(self, driver: WebDriver, sleep_time: float) -> None:
+        
+        self._send_key_to_body(driver, Keys.PAGE_UP, sleep_time)
+        
+    def _scroll_top(self, driver: WebDriver, sleep_time: float) -> None:
+        
+        self._send_key_to_body(driver, Keys.HOME, sleep_time)
         
-        if scroll_down_from_top:
+    def _scroll_end(self, driver: WebDriver, sleep_time: float) -> None:
+        
+        self._send_key_to_body(driver, Keys.END, sleep_time)
+        
+    def _send_key_to_body(self, driver: WebDriver, key: str, sleep_time: float) -> None:
+        
+        with self.metrics.phase('scroll'):
+            
+            state_before = self._pacer.get_load_state(driver)
+            self._send_key(driver, key)
+                
+        with self.metrics.phase('wait'):
+            self._pacer.wait(driver, state_before, sleep_time, key)
             
-            return scroll_end_count * 4 + 11
+        self.metrics.count('scrolls')
         
-        else:
+    async def _scroll_end_async(self, driver: WebDriver, sleep_time: float) -> None:
         
-            return scroll_end_count * 4
+        await self._send_key_to_body_async(driver, Keys.END, sleep_time)
         
-    def _get_scroll_up_times(self, scroll_end_count: int):
+    async def _send_key_to_body_async(self, driver: WebDriver, key: str, sleep_time: float) -> None:
         
-        return scroll_end_count * 4
-    
-    def _scroll_down(self, driver: Edge, sleep_time: float) -> None:
+        with self.metrics.phase('scroll'):
+            
+            state_before = await self._run_blocking(self._pacer.get_load_state, driver)
+            await self._run_blocking(self._send_key, driver, key)
+            
+        with self.metrics.phase('wait'):
+            await self._pacer.wait_async(driver, state_before, sleep_time, key, self._run_blocking)
+            
+        self.metrics.count('scrolls')
+        
+    def _send_key(self, driver: WebDriver, key: str) -> None:
+        
+        try:
+            
+            self._get_body(driver).send_keys(key)
+            
+        except StaleElementReferenceException:
+            
+            self._body_elements.pop(driver.session_id, None)
+            self._get_body(driver).send_keys(key)
+            
+    async def _run_blocking(self, function: Callable, *args):
+        
+        return await asyncio.get_running_loop().run_in_executor(self._executor, functools.partial(function, *args))
+        
+    def _get_body(self, driver: WebDriver) -> WebElement:
+        
+        if driver.session_id not in self._body_elements:
+            
+            wait = WebDriverWait(driver, 10)
+            
+            self._body_elements[driver.session_id] = wait.until(EC.visibility_of_element_located((By.TAG_NAME, "body")))
+            
+        return self._body_elements[driver.session_id]
+        
+    def _click_to_see_replies(self, driver: WebDriver, only_new: bool = False) -> None:
+        
+        selector: str = '#more-replies > yt-button-shape > button > yt-touch-feedback-shape > div'
+        
+        if only_new:
+            selector = 'ytd-comment-thread-renderer:not([data-harvested]) ' + selector
+        
+        counter, failed = self._click_all(driver, selector, False, REPLIES_SETTLE_TIMEOUT)
+            
+        logging.info(f'click to see replies: {counter}, failed: {failed}')
+            
+    def _click_to_see_more_replies(self, driver: WebDriver, only_new: bool = False) -> int:
+        
+        selector: str = '#button > ytd-button-renderer > yt-button-shape > button'
+        
+        if only_new:
+            selector = 'ytd-comment-thread-renderer:not([data-harvested]) ' + selector
+        
+        counter, failed = self._click_all(driver, selector, False, REPLIES_SETTLE_TIMEOUT)
+            
+        logging.info(f'click to see more replies: {counter}, failed: {failed}')
         
-        wait = WebDriverWait(driver, 10)
+        return counter
+        
+    def _click_to_read_more(self, driver: WebDriver, only_new: bool = False) -> None:
+        
+        xpath: str = '//*[@id="more"]/span'
+        
+        if only_new:
+            xpath = '//ytd-comment-thread-renderer[not(@data-harvested)]' + xpath
+        
+        counter, failed = self._click_all(driver, xpath, True, 0)
+            
+        logging.info(f'click to read more: {counter}, failed: {failed}')
+        
+    def _click_all(self, driver: WebDriver, locator: str, is_xpath: bool, settle_timeout: float) -> Tuple[int, int]:
+        
+        try:
+            
+            with self.metrics.phase('expand'):
                 
-        wait.until(EC.visibility_of_element_located((By.TAG_NAME, "body"))).send_keys(Keys.PAGE_DOWN)
-        time.sleep(sleep_time)
+                driver.set_script_timeout(settle_timeout + 30)
+                result = driver.execute_async_script(CLICK_ALL_SCRIPT, locator, is_xpath, int(settle_timeout * 1000))
+            
+        except TimeoutException:
+            
+            logging.info(f'clicking timed out: {locator}')
+            
+            return 0, 0
+        
+        self.metrics.count('clicks', result['clicked'])
+        self.metrics.count('click_failures', result['failed'])
+        
+        if result['pending'] > 0:
+            logging.info(f'reply continuations still loading after {settle_timeout}s: {result["pending"]}')
+        
+        return result['clicked'], result['failed']
 
-    def _scroll_up(self, driver: Edge, sleep_time: float) -> None:
+    def _trim_page_memory(self, driver: WebDriver) -> None:
         
-        wait = WebDriverWait(driver, 10)
-                
-        wait.until(EC.visibility_of_element_located((By.TAG_NAME, "body"))).send_keys(Keys.PAGE_UP)
-        time.sleep(sleep_time)
+        if not self._page_memory_trimmer.enabled:
+            return
         
-    def _scroll_top(self, driver: Edge, sleep_time: float) -> None:
+        trimmed_threads_before: int = self._page_memory_trimmer.trimmed_threads
         
-        wait = WebDriverWait(driver, 10)
-                
-        wait.until(EC.visibility_of_element_located((By.TAG_NAME, "body"))).send_keys(Keys.HOME)
-        time.sleep(sleep_time)
+        with self.metrics.phase('trim'):
+            self._page_memory_trimmer.trim(driver)
+            
+        self.metrics.count('trimmed_threads', self._page_memory_trimmer.trimmed_threads - trimmed_threads_before)
         
-    def _scroll_end(self, driver: Edge, sleep_time: float) -> None:
+    def _get_comment_data(self, driver: WebDriver, only_new: bool = False) -> List[Dict[str, str]]:
         
-        wait = WebDriverWait(driver, 10)
-                
-        wait.until(EC.visibility_of_element_located((By.TAG_NAME, "body"))).send_keys(Keys.END)
-        time.sleep(sleep_time)
+        with self.metrics.phase('extract'):
+            comment_records: List[Dict[str, str]] = driver.execute_script(COMMENT_RECORDS_SCRIPT, only_new)
+        
+        number_of_comments_gotten = len(comment_records)
+        self.metrics.count('comments_extracted', number_of_comments_gotten)
+        logging.info(f'got comments this time: {number_of_comments_gotten}')
         
-    def _click_to_see_replies(self, driver: Edge) -> None:
+        return comment_records
+
+def _init_scraper_worker(log_file_path: str) -> None:
+    
+    logging.basicConfig(filename=log_file_path, level=logging.INFO, format='%(asctime)s - %(processName)s - %(levelname)s - %(message)s')
+    
+def _watch_browser_memory(memory_limit_mb: int, stop_event: threading.Event) -> None:
+    
+    # Browsers are children of the worker process (msedgedriver -> msedge), so
+    # the whole child tree is measured. Killing it makes the running scrape fail
+    # with a WebDriverException, and the pool then retries the video.
+    worker_process = psutil.Process(os.getpid())
+    
+    while not stop_event.wait(5):
         
-        counter: int = 0
+        children = worker_process.children(recursive=True)
+        memory_used_mb: float = 0
         
-        for link in driver.find_elements(By.CSS_SELECTOR, '#more-replies > yt-button-shape > button > yt-touch-feedback-shape > div'):
+        for child in children:
             
             try:
-                
-                driver.execute_script("arguments[0].click();", link)
-                time.sleep(0.5)
-                
-                counter += 1
-
-            except:
+                memory_used_mb += child.memory_info().rss / (1024 * 1024)
+            except psutil.Error:
                 pass
             
-        logging.info(f'click to see replies: {counter}')
+        if memory_used_mb > memory_limit_mb:
+            
+            logging.info(f'Browser memory {memory_used_mb:.0f} MB exceeds the limit of {memory_limit_mb} MB, killing the browser')
+            
+            for child in children:
+                
+                try:
+                    child.kill()
+                except psutil.Error:
+                    pass
             
-    def _click_to_see_more_replies(self, driver: Edge) -> None:
+_worker_browser_session_pool: Optional[BrowserSessionPool] = None
+
+def _get_worker_browser_session_pool(browser: str, driver_path: str, max_videos_per_session: int) -> BrowserSessionPool:
+    
+    # One warm session per worker process, reused for every video it scrapes
+    global _worker_browser_session_pool
+    
+    if _worker_browser_session_pool is None:
         
-        counter: int = 0
+        _worker_browser_session_pool = BrowserSessionPool(browser, driver_path, size=1, headless=True, max_videos_per_session=max_videos_per_session)
+        multiprocessing.util.Finalize(_worker_browser_session_pool, _worker_browser_session_pool.close, exitpriority=10)
         
-        for link in driver.find_elements(By.CSS_SELECTOR, '#button > ytd-button-renderer > yt-button-shape > button'):
+    return _worker_browser_session_pool
 
-            try:
-                
-                driver.execute_script("arguments[0].click();", link)
-                time.sleep(0.5)
-                
-                counter += 1
+def _scrape_video_in_worker(edge_driver_path: str, browser: str, max_videos_per_session: int, youtube_video: YoutubeVideo, number_of_comments_to_scrape: int, scrape_method: str, scrape_replies: bool, memory_limit_mb: Optional[int], output_path: str, chunk_size: int, checkpoint_path: Optional[str], resume: bool, trim_page_memory: bool = False, comment_store_path: Optional[str] = None, incremental: bool = False) -> Tuple[int, int]:
+    
+    stop_event = threading.Event()
+    
+    if memory_limit_mb is not None:
+        
+        if psutil is None:
+            logging.info('psutil is not installed, the browser memory limit is not enforced')
+        else:
+            threading.Thread(target=_watch_browser_memory, args=(memory_limit_mb, stop_event), daemon=True).start()
+    
+    try:
+        
+        browser_session_pool = _get_worker_browser_session_pool(browser, edge_driver_path, max_videos_per_session)
+        youtube_comment_scraper = YoutubeCommentScraper(edge_driver_path, youtube_video.video_title, youtube_video.video_url, youtube_video.tags, headless=True, browser=browser, browser_session_pool=browser_session_pool)
+        
+        with create_comment_sink(output_path, chunk_size) as comment_sink:
+            youtube_comment_scraper.scrape_comments(number_of_comments_to_scrape=number_of_comments_to_scrape, scrape_method=scrape_method, scrape_replies=scrape_replies, comment_sink=comment_sink, checkpoint_path=checkpoint_path, resume=resume, report_path=get_report_path(output_path), trim_page_memory=trim_page_memory, comment_store_path=comment_store_path, incremental=incremental)
+        
+    finally:
+        stop_event.set()
+        
+    return youtube_comment_scraper.count_of_total_comments, youtube_comment_scraper.count_of_scraped_comments
 
-            except:
-                pass
-            
-        logging.info(f'click to see more replies: {counter}')
+class ScraperWorkerPool:
+    
+    # Every worker streams its video into the output file through a comment
+    # sink, a retried video rewrites its file from the start. With a
+    # checkpoint folder, retries resume from the failed attempt's checkpoint
+    # instead of scraping everything again. With a comment store folder, each
+    # video's comments are merged into <folder>/<video title>.sqlite, and with
+    # incremental the output only holds comments that are not in it yet.
+    
+    def __init__(self, edge_driver_path: str, log_file_path: str, number_of_workers: int = 4, max_retries: int = 2, memory_limit_mb: Optional[int] = None, output_format: str = 'csv', chunk_size: int = 500, checkpoint_folder: Optional[str] = None, browser: str = 'edge', max_videos_per_session: int = 10, trim_page_memory: bool = False, comment_store_folder: Optional[str] = None, incremental: bool = False) -> None:
+        
+        self.edge_driver_path = edge_driver_path
+        self.log_file_path = log_file_path
+        self.number_of_workers = number_of_workers
+        self.max_retries = max_retries
+        self.memory_limit_mb = memory_limit_mb
+        self.output_format = output_format
+        self.chunk_size = chunk_size
+        self.checkpoint_folder = checkpoint_folder
+        self.browser = browser
+        self.max_videos_per_session = max_videos_per_session
+        self.trim_page_memory = trim_page_memory
+        self.comment_store_folder = comment_store_folder
+        self.incremental = incremental
+        
+    def scrape_videos(self, youtube_videos: List[YoutubeVideo], number_of_comments_to_scrape: int, scrape_method: str = 'simple', scrape_replies: bool = False) -> Dict[str, int]:
         
-    def _click_to_read_more(self, driver: Edge) -> None:
+        # Largest first so the longest videos do not end up running alone at
+        # the end. Videos without a comment count hint are scheduled first.
+        youtube_videos = sorted(youtube_videos, key=lambda v: float('inf') if v.count_of_total_comments is None else v.count_of_total_comments, reverse=True)
         
-        counter: int = 0
+        results: Dict[str, int] = {}
+        attempts: Dict[str, int] = {}
         
-        for link in driver.find_elements(By.XPATH, '//*[@id="more"]/span'):
+        with ProcessPoolExecutor(max_workers=self.number_of_workers, initializer=_init_scraper_worker, initargs=(self.log_file_path,)) as executor:
             
-            try:
+            running: Dict[Future, YoutubeVideo] = {}
+            
+            def submit(youtube_video: YoutubeVideo) -> None:
                 
-                driver.execute_script("arguments[0].click();", link)
-                time.sleep(0.5)
+                attempts[youtube_video.video_url] = attempts.get(youtube_video.video_url, 0) + 1
                 
-                counter += 1
-
-            except:
-                pass
+                output_path: str = get_output_path(youtube_video, self.output_format)
+                checkpoint_path: Optional[str] = None
+                
+                if self.checkpoint_folder is not None:
+                    checkpoint_path = os.path.join(self.checkpoint_folder, youtube_video.video_title)
+                    
+                comment_store_path: Optional[str] = None
+                
+                if self.comment_store_folder is not None:
+                    comment_store_path = get_comment_store_path(self.comment_store_folder, youtube_video)
+                
+                future = executor.submit(_scrape_video_in_worker, self.edge_driver_path, self.browser, self.max_videos_per_session, youtube_video, number_of_comments_to_scrape, scrape_method, scrape_replies, self.memory_limit_mb, output_path, self.chunk_size, checkpoint_path, attempts[youtube_video.video_url] > 1, self.trim_page_memory, comment_store_path, self.incremental)
+                running[future] = youtube_video
             
-        logging.info(f'click to read more: {counter}')
-
-    def _get_comment_data(self, driver: Edge) -> Tuple[List[str], List[str], List[str]]:
+            for youtube_video in youtube_videos:
+                submit(youtube_video)
+                
+            while running:
+                
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                
+                for future in finished:
+                    
+                    youtube_video = running.pop(future)
+                    
+                    try:
+                        
+                        count_of_total_comments, count_of_scraped_comments = future.result()
+                        
+                    except Exception as e:
+                        
+                        logging.info(f'Scraping for {youtube_video.video_title} failed on attempt {attempts[youtube_video.video_url]}: {e!r}')
+                        
+                        if attempts[youtube_video.video_url] <= self.max_retries:
+                            submit(youtube_video)
+                            
+                        continue
+                    
+                    youtube_video.count_of_total_comments = count_of_total_comments
+                    results[youtube_video.video_url] = count_of_scraped_comments
+                    
+                    logging.info(f'{youtube_video.video_title} has {count_of_total_comments} comments in total')
+                    logging.info(f'The worker pool scrapped {count_of_scraped_comments} for {youtube_video.video_title}')
+                    
+        return results
+    
+class AsyncScraperPool:
+    
+    # Scrapes many videos from one process on an asyncio event loop, as an
+    # alternative to the process based ScraperWorkerPool. Up to
+    # number_of_sessions videos run at once on pooled headless sessions. Their
+    # WebDriver calls run on a shared thread pool and their waits on the event
+    # loop, and all output goes through one AsyncCommentWriter.
+    
+    def __init__(self, edge_driver_path: str, number_of_sessions: int = 4, max_retries: int = 2, output_format: str = 'csv', chunk_size: int = 500, checkpoint_folder: Optional[str] = None, browser: str = 'edge', max_videos_per_session: int = 10, trim_page_memory: bool = False, comment_store_folder: Optional[str] = None, incremental: bool = False, max_pending_chunks: int = 16) -> None:
         
-        wait = WebDriverWait(driver, 10)
+        self.edge_driver_path = edge_driver_path
+        self.number_of_sessions = number_of_sessions
+        self.max_retries = max_retries
+        self.output_format = output_format
+        self.chunk_size = chunk_size
+        self.checkpoint_folder = checkpoint_folder
+        self.browser = browser
+        self.max_videos_per_session = max_videos_per_session
+        self.trim_page_memory = trim_page_memory
+        self.comment_store_folder = comment_store_folder
+        self.incremental = incremental
+        self.max_pending_chunks = max_pending_chunks
         
-        comment_text_list = wait.until(EC.presence_of_all_elements_located((By.XPATH, '//*[@id="content-text"]')))
-        time_elapsed_since_comment_list = wait.until(EC.presence_of_all_elements_located((By.XPATH, '//*[@id="header-author"]/yt-formatted-string/a')))
-        author_list = wait.until(EC.presence_of_all_elements_located((By.XPATH, '//*[@id="author-text"]')))
+    async def scrape_videos(self, youtube_videos: List[YoutubeVideo], number_of_comments_to_scrape: int, scrape_method: str = 'streaming', scrape_replies: bool = False) -> Dict[str, int]:
         
-        number_of_comments_gotten = len(comment_text_list)
-        logging.info(f'got comments this time: {number_of_comments_gotten}')
+        youtube_videos = sorted(youtube_videos, key=lambda v: float('inf') if v.count_of_total_comments is None else v.count_of_total_comments, reverse=True)
         
-        return comment_text_list, time_elapsed_since_comment_list, author_list           
+        results: Dict[str, int] = {}
+        sessions = asyncio.Semaphore(self.number_of_sessions)
+        browser_session_pool = BrowserSessionPool(self.browser, self.edge_driver_path, size=self.number_of_sessions, headless=True, max_videos_per_session=self.max_videos_per_session)
+        executor = ThreadPoolExecutor(max_workers=self.number_of_sessions * 2)
+        
+        try:
+            
+            async with AsyncCommentWriter(self.max_pending_chunks) as comment_writer:
+                
+                await asyncio.gather(*(self._scrape_video(youtube_video, number_of_comments_to_scrape, scrape_method, scrape_replies, results, sessions, browser_session_pool, comment_writer, executor) for youtube_video in youtube_videos))
+                
+            logging.info(f'peak pending chunks: {comment_writer.peak_pending_chunks} of {self.max_pending_chunks}')
+                
+        finally:
+            
+            await asyncio.get_running_loop().run_in_executor(executor, browser_session_pool.close)
+            executor.shutdown()
             
-    def _remove_duplicates(self, comment_text_list, time_elapsed_since_comment_list, author_list):
+        return results
+    
+    async def _scrape_video(self, youtube_video: YoutubeVideo, number_of_comments_to_scrape: int, scrape_method: str, scrape_replies: bool, results: Dict[str, int], sessions: asyncio.Semaphore, browser_session_pool: BrowserSessionPool, comment_writer: AsyncCommentWriter, executor: ThreadPoolExecutor) -> None:
+        
+        loop = asyncio.get_running_loop()
+        output_path: str = get_output_path(youtube_video, self.output_format)
+        checkpoint_path: Optional[str] = None
+        comment_store_path: Optional[str] = None
         
-        unique_c = []
-        unique_t = []
-        unique_a = []
-        seen = set()
+        if self.checkpoint_folder is not None:
+            checkpoint_path = os.path.join(self.checkpoint_folder, youtube_video.video_title)
+            
+        if self.comment_store_folder is not None:
+            comment_store_path = get_comment_store_path(self.comment_store_folder, youtube_video)
         
-        for c, t, a in zip(comment_text_list, time_elapsed_since_comment_list, author_list):
+        for attempt in range(1, self.max_retries + 2):
             
-            if c not in seen:
-                unique_c.append(c)
-                unique_t.append(t)
-                unique_a.append(a)
-                seen.add(c)
+            async with sessions:
                 
-        number_of_duplicates = len(comment_text_list) - len(seen)
+                youtube_comment_scraper = YoutubeCommentScraper(self.edge_driver_path, youtube_video.video_title, youtube_video.video_url, youtube_video.tags, headless=True, browser=self.browser, browser_session_pool=browser_session_pool)
+                comment_sink = comment_writer.get_sink(await loop.run_in_executor(executor, create_comment_sink, output_path, self.chunk_size))
                 
-        logging.info(f'removed duplicates: {number_of_duplicates}')
+                try:
+                    
+                    await youtube_comment_scraper.scrape_comments_async(number_of_comments_to_scrape, scrape_method, scrape_replies, comment_sink=comment_sink, checkpoint_path=checkpoint_path, resume=attempt > 1, report_path=get_report_path(output_path), trim_page_memory=self.trim_page_memory, comment_store_path=comment_store_path, incremental=self.incremental, executor=executor)
+                    
+                except Exception as e:
+                    
+                    logging.info(f'Scraping for {youtube_video.video_title} failed on attempt {attempt}: {e!r}')
+                    
+                    continue
                 
-        return unique_c, unique_t, unique_a
+                finally:
+                    await loop.run_in_executor(executor, comment_sink.close)
+                    
+            youtube_video.count_of_total_comments = youtube_comment_scraper.count_of_total_comments
+            results[youtube_video.video_url] = youtube_comment_scraper.count_of_scraped_comments
+            
+            logging.info(f'{youtube_video.video_title} has {youtube_comment_scraper.count_of_total_comments} comments in total')
+            logging.info(f'The async pool scrapped {youtube_comment_scraper.count_of_scraped_comments} for {youtube_video.video_title}')
+            
+            return
+    
+def get_output_path(youtube_video: YoutubeVideo, output_format: str = 'csv') -> str:
+    
+    return f'output_{youtube_video.video_title}.{output_format}'
+
+def get_comment_store_path(comment_store_folder: str, youtube_video: YoutubeVideo) -> str:
+    
+    return os.path.join(comment_store_folder, f'{youtube_video.video_title}.sqlite')
+
+def get_report_path(output_path: str) -> str:
+    
+    return f'{os.path.splitext(output_path)[0]}.report.json'
 
 def main():
 
@@ -437,41 +3439,65 @@ def main():
     ]   
 
     edge_driver_path = r'C:\Program Files\drivers\msedgedriver_114.exe'
+    
+    # 'edge' or 'chrome' (Chrome/Chromium, with edge_driver_path pointing to
+    # chromedriver). Each worker reuses one warm browser session for up to
+    # max_videos_per_session videos.
+    browser: str = 'edge'
+    max_videos_per_session: int = 10
 
     number_of_comments_to_scrape: int = 100
     scrape_method: str = 'simple'
     
-    for youtube_video in youtube_videos_to_scrape:
-        
-        logging.info(f'-----  Scraping for {youtube_video.video_title} starts  -----')
-        
-        result_list: List[YoutubeComment] = []
-        output = pd.DataFrame()
-        
-        youtube_comment_scraper = YoutubeCommentScraper(edge_driver_path, youtube_video.video_title, youtube_video.video_url, youtube_video.tags)
-        youtube_comment_scraper.clear_comments()
-        youtube_comment_scraper.scrape_comments(number_of_comments_to_scrape=number_of_comments_to_scrape, scrape_method=scrape_method, scrape_replies=True)
-        
-        number_of_scrapped_comments: int = len(youtube_comment_scraper.scraped_youtube_comments)
+    # Removes harvested comment threads from the page during long scrolls so
+    # the browser tab does not grow without bound on large videos.
+    trim_page_memory: bool = False
+    
+    # Each worker drives its own headless browser. memory_limit_mb caps the
+    # browser memory of a single worker (requires psutil).
+    number_of_workers: int = 4
+    max_retries: int = 2
+    memory_limit_mb: Optional[int] = 4096
+    
+    # Comments are appended to output_<video title>.<output_format> in chunks
+    # of chunk_size while they are scraped. Formats: csv, jsonl, parquet.
+    output_format: str = 'csv'
+    chunk_size: int = 500
+    
+    # Checkpoints let a retried video continue where the failed attempt stopped
+    checkpoint_folder_path = os.path.join(script_location, "checkpoint_folder")
+    
+    if not os.path.exists(checkpoint_folder_path):
+        os.makedirs(checkpoint_folder_path)
+    
+    # Every video's comments are kept in comment_store_folder across runs. With
+    # incremental, a re-scrape reads the comments newest first (streaming or
+    # innertube method) and stops once it reaches comments it already has.
+    comment_store_folder_path = os.path.join(script_location, "comment_store_folder")
+    incremental: bool = False
+    
+    if not os.path.exists(comment_store_folder_path):
+        os.makedirs(comment_store_folder_path)
+    
+    # 'processes' runs one browser per worker process. 'async' drives
+    # number_of_workers browser sessions from this process on an event loop,
+    # which suits the streaming method best.
+    orchestration: str = 'processes'
+    
+    if orchestration == 'async':
         
-        logging.info(f'{youtube_video.video_title} has {youtube_comment_scraper.count_of_total_comments} comments in total')
-        logging.info(f'The youtube_comment_scraper scrapped {number_of_scrapped_comments} for {youtube_video.video_title}')
+        async_pool = AsyncScraperPool(edge_driver_path, number_of_sessions=number_of_workers, max_retries=max_retries, output_format=output_format, chunk_size=chunk_size, checkpoint_folder=checkpoint_folder_path, browser=browser, max_videos_per_session=max_videos_per_session, trim_page_memory=trim_page_memory, comment_store_folder=comment_store_folder_path, incremental=incremental)
+        results = asyncio.run(async_pool.scrape_videos(youtube_videos_to_scrape, number_of_comments_to_scrape=number_of_comments_to_scrape, scrape_method=scrape_method, scrape_replies=True))
         
-        result_list = youtube_comment_scraper.scraped_youtube_comments
+    else:
         
-        logging.info(f'-----  Scraping for {youtube_video.video_title} ends  -----')
+        worker_pool = ScraperWorkerPool(edge_driver_path, log_file_path, number_of_workers=number_of_workers, max_retries=max_retries, memory_limit_mb=memory_limit_mb, output_format=output_format, chunk_size=chunk_size, checkpoint_folder=checkpoint_folder_path, browser=browser, max_videos_per_session=max_videos_per_session, trim_page_memory=trim_page_memory, comment_store_folder=comment_store_folder_path, incremental=incremental)
+        results = worker_pool.scrape_videos(youtube_videos_to_scrape, number_of_comments_to_scrape=number_of_comments_to_scrape, scrape_method=scrape_method, scrape_replies=True)
     
-        data = {
-            'comment_text': [c.comment_text for c in result_list],
-            'time_elapsed_since_comment': [c.time_elapsed_since_comment for c in result_list],
-            'author': [c.author for c in result_list],
-            'time_of_collection': [c.time_of_collection for c in result_list],
-            'from_video': [c.from_video for c in result_list],
-            'tags': [c.tags for c in result_list]
-        }
-    
-        output = pd.DataFrame(data)
-        output.to_csv(f'output_{youtube_video.video_title}.csv', encoding='utf-8-sig')
+    for youtube_video in youtube_videos_to_scrape:
+        
+        if youtube_video.video_url not in results:
+            logging.info(f'-----  Scraping for {youtube_video.video_title} gave up after retries  -----')
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
@@ -0,0 +1,57 @@
+import os
+import sys
+from contextlib import contextmanager
+
+import pytest
+
+# The scraper and the benchmark are plain modules in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from scrapeYoutubeComment import ScrapeCheckpoint
+from benchmarkYoutubeComment import FixtureWatchPageServer
+
+class ScrapeKilled(Exception):
+    pass
+
+@pytest.fixture
+def fixture():
+
+    with FixtureWatchPageServer(population=300, latency_ms=0, page_size=20) as fixture:
+        yield fixture
+
+@pytest.fixture
+def kill_after(monkeypatch):
+
+    # Fails the run on the given call of cls.name. The checkpoint fails to close
+    # as well, so nothing else is saved on the way out, as if the process had
+    # been killed.
+    @contextmanager
+    def kill_after(cls, name: str, number_of_calls: int):
+
+        function = getattr(cls, name)
+        calls = {'count': 0}
+
+        def killing_function(*args, **kwargs):
+
+            calls['count'] += 1
+
+            if calls['count'] > number_of_calls:
+                raise ScrapeKilled()
+
+            return function(*args, **kwargs)
+
+        def killing_close(self, finished: bool) -> None:
+
+            self._records_file.close()
+
+            raise ScrapeKilled()
+
+        with monkeypatch.context() as patch:
+
+            patch.setattr(cls, name, killing_function)
+            patch.setattr(ScrapeCheckpoint, 'close', killing_close)
+
+            with pytest.raises(ScrapeKilled):
+                yield
+
+    return kill_after
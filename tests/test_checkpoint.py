@@ -0,0 +1,129 @@
+import os
+import json
+
+import pytest
+
+from scrapeYoutubeComment import YoutubeCommentScraper, InnertubeCommentClient
+
+# The browser methods need a driver, e.g. SCRAPER_DRIVER_PATH=/usr/bin/chromedriver
+# SCRAPER_BROWSER=chrome; without one their tests are skipped.
+DRIVER_PATH = os.environ.get('SCRAPER_DRIVER_PATH')
+BROWSER = os.environ.get('SCRAPER_BROWSER', 'edge')
+
+def get_comment_ids(youtube_comment_scraper: YoutubeCommentScraper) -> list:
+
+    return [c.comment_id for c in youtube_comment_scraper.scraped_youtube_comments]
+
+def load_state(checkpoint_path: str) -> dict:
+
+    with open(f'{checkpoint_path}.state.json', encoding='utf-8') as state_file:
+        return json.load(state_file)
+
+def test_innertube_resumes_after_kill(fixture, kill_after, tmp_path):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    # Killed on the 13th page, after the checkpoint saved at 200 comments
+    with kill_after(InnertubeCommentClient, 'get_comment_page', 12):
+        YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path)
+
+    state = load_state(checkpoint_path)
+
+    assert state['finished'] is False
+    assert state['position'] == {'continuation_token': 'page:10', 'sort_order': 'top'}
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, resume=True)
+
+    comment_ids = get_comment_ids(youtube_comment_scraper)
+
+    assert len(comment_ids) == 300
+    assert set(comment_ids) == fixture.get_expected_comment_ids(False)
+    assert youtube_comment_scraper.metrics.counters['pages'] == 5
+    assert load_state(checkpoint_path)['finished'] is True
+
+def test_innertube_reaching_target_keeps_position(fixture, tmp_path):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(100, 'innertube', checkpoint_path=checkpoint_path)
+
+    state = load_state(checkpoint_path)
+
+    assert state['finished'] is False
+    assert state['position'] == {'continuation_token': 'page:5', 'sort_order': 'top'}
+
+    # A higher target continues where the first run stopped
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(200, 'innertube', checkpoint_path=checkpoint_path, resume=True)
+
+    comment_ids = get_comment_ids(youtube_comment_scraper)
+
+    assert comment_ids == [f'c{i}' for i in range(200)]
+    assert youtube_comment_scraper.metrics.counters['pages'] == 5
+    assert load_state(checkpoint_path)['finished'] is False
+
+def test_innertube_target_within_a_page_keeps_its_position(fixture, tmp_path):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    # The target stops part way through the sixth page, which is read again
+    YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(110, 'innertube', checkpoint_path=checkpoint_path)
+
+    assert load_state(checkpoint_path)['position'] == {'continuation_token': 'page:5', 'sort_order': 'top'}
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(200, 'innertube', checkpoint_path=checkpoint_path, resume=True)
+
+    assert get_comment_ids(youtube_comment_scraper) == [f'c{i}' for i in range(200)]
+
+def test_innertube_target_within_the_last_page_is_not_finished(fixture, tmp_path):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(290, 'innertube', checkpoint_path=checkpoint_path)
+
+    assert load_state(checkpoint_path)['finished'] is False
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, resume=True)
+
+    assert get_comment_ids(youtube_comment_scraper) == [f'c{i}' for i in range(300)]
+    assert load_state(checkpoint_path)['finished'] is True
+
+def test_innertube_finished_checkpoint_is_not_scraped_again(fixture, tmp_path):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path)
+
+    assert load_state(checkpoint_path)['finished'] is True
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(2000, 'innertube', checkpoint_path=checkpoint_path, resume=True)
+
+    assert len(get_comment_ids(youtube_comment_scraper)) == 300
+    assert 'pages' not in youtube_comment_scraper.metrics.counters
+    assert load_state(checkpoint_path)['finished'] is True
+
+@pytest.mark.skipif(DRIVER_PATH is None, reason='needs a browser driver in SCRAPER_DRIVER_PATH')
+@pytest.mark.parametrize('scrape_method', ['batched', 'streaming'])
+def test_browser_resumes_after_kill(fixture, kill_after, tmp_path, scrape_method):
+
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    # Killed after the third harvest, part way down the page
+    with kill_after(YoutubeCommentScraper, '_trim_page_memory', 3):
+        YoutubeCommentScraper(DRIVER_PATH, 'fixture', fixture.video_url, headless=True, browser=BROWSER).scrape_comments(250, scrape_method, checkpoint_path=checkpoint_path)
+
+    assert load_state(checkpoint_path)['finished'] is False
+
+    youtube_comment_scraper = YoutubeCommentScraper(DRIVER_PATH, 'fixture', fixture.video_url, headless=True, browser=BROWSER)
+    youtube_comment_scraper.scrape_comments(250, scrape_method, checkpoint_path=checkpoint_path, resume=True)
+
+    comment_ids = get_comment_ids(youtube_comment_scraper)
+
+    assert len(comment_ids) == 250
+    assert len(set(comment_ids)) == 250
+    assert set(comment_ids) <= fixture.get_expected_comment_ids(False)
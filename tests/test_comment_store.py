@@ -0,0 +1,48 @@
+from scrapeYoutubeComment import YoutubeCommentScraper, InnertubeCommentClient, CommentStore
+
+def get_comment_ids(youtube_comment_scraper: YoutubeCommentScraper) -> list:
+
+    return [c.comment_id for c in youtube_comment_scraper.scraped_youtube_comments]
+
+def get_store_size(path: str) -> int:
+
+    with CommentStore(path) as comment_store:
+        return len(comment_store)
+
+def test_incremental_refresh_leaves_out_known_comments(fixture, tmp_path):
+
+    path = str(tmp_path / 'comments.sqlite')
+
+    YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(100, 'innertube', comment_store_path=path)
+
+    assert get_store_size(path) == 100
+
+    # The fixture only offers top order, so the refresh reads every page and
+    # keeps the comments the first run did not collect
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(1000, 'innertube', comment_store_path=path, incremental=True)
+
+    assert get_comment_ids(youtube_comment_scraper) == [f'c{i}' for i in range(100, 300)]
+    assert youtube_comment_scraper.metrics.counters['known_comments'] == 100
+    assert get_store_size(path) == 300
+
+def test_incremental_resume_collects_comments_lost_by_the_kill(fixture, kill_after, tmp_path):
+
+    path = str(tmp_path / 'comments.sqlite')
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    # Killed after 260 comments; only the 200 the checkpoint saved are known
+    with kill_after(InnertubeCommentClient, 'get_comment_page', 13):
+        YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, comment_store_path=path, incremental=True)
+
+    assert get_store_size(path) == 200
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, resume=True, comment_store_path=path, incremental=True)
+
+    comment_ids = get_comment_ids(youtube_comment_scraper)
+
+    assert len(comment_ids) == 300
+    assert set(comment_ids) == fixture.get_expected_comment_ids(False)
+    assert youtube_comment_scraper.metrics.counters.get('known_comments', 0) == 0
+    assert get_store_size(path) == 300
@@ -0,0 +1,68 @@
+import os
+
+from scrapeYoutubeComment import YoutubeCommentScraper, InnertubeCommentClient, CommentDedupIndex, CsvCommentSink
+from benchmarkYoutubeComment import FixtureWatchPageServer, get_fixture_comment
+
+def test_digests_are_written_once_persisted(tmp_path):
+
+    path = str(tmp_path / 'digests')
+    dedup_index = CommentDedupIndex(path)
+
+    assert len(dedup_index.add_new([get_fixture_comment(i) for i in range(10)])) == 10
+
+    dedup_index.persist(4)
+    dedup_index.close()
+
+    # Only the persisted digests survive, the others are collected again
+    dedup_index = CommentDedupIndex(path)
+
+    assert len(dedup_index) == 4
+    assert len(dedup_index.add_new([get_fixture_comment(i) for i in range(10)])) == 6
+
+    dedup_index.close()
+
+def test_digests_follow_the_sink(tmp_path):
+
+    path = str(tmp_path / 'digests')
+
+    with FixtureWatchPageServer(population=300, latency_ms=0, page_size=20) as fixture:
+
+        youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+        dedup_index_sizes = []
+
+        # Records the digests on disk after every page
+        store_new_comment_records = youtube_comment_scraper._store_new_comment_records
+
+        def recording_store_new_comment_records(*args):
+
+            store_new_comment_records(*args)
+            dedup_index_sizes.append(os.path.getsize(path) // CommentDedupIndex.digest_size)
+
+        youtube_comment_scraper._store_new_comment_records = recording_store_new_comment_records
+
+        with CsvCommentSink(str(tmp_path / 'comments.csv'), chunk_size=50) as comment_sink:
+            youtube_comment_scraper.scrape_comments(1000, 'innertube', comment_sink=comment_sink, dedup_index_path=path)
+
+    assert dedup_index_sizes[:5] == [0, 0, 50, 50, 100]
+    assert os.path.getsize(path) // CommentDedupIndex.digest_size == 300
+
+def test_resume_keeps_checkpointed_comments(fixture, kill_after, tmp_path):
+
+    path = str(tmp_path / 'digests')
+    checkpoint_path = str(tmp_path / 'checkpoint')
+
+    # Killed after 260 comments; the checkpoint saved 200 of them and only
+    # their digests are written
+    with kill_after(InnertubeCommentClient, 'get_comment_page', 13):
+        YoutubeCommentScraper('', 'fixture', fixture.video_url).scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, dedup_index_path=path)
+
+    assert os.path.getsize(path) // CommentDedupIndex.digest_size == 200
+
+    youtube_comment_scraper = YoutubeCommentScraper('', 'fixture', fixture.video_url)
+    youtube_comment_scraper.scrape_comments(1000, 'innertube', checkpoint_path=checkpoint_path, resume=True, dedup_index_path=path)
+
+    comment_ids = [c.comment_id for c in youtube_comment_scraper.scraped_youtube_comments]
+
+    assert len(comment_ids) == 300
+    assert set(comment_ids) == fixture.get_expected_comment_ids(False)
+    assert os.path.getsize(path) // CommentDedupIndex.digest_size == 300
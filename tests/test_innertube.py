@@ -0,0 +1,49 @@
+import os
+import json
+
+from scrapeYoutubeComment import InnertubeCommentClient
+
+FIXTURES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fixtures')
+
+def parse_fixture(name: str):
+
+    with open(os.path.join(FIXTURES, name), encoding='utf-8') as fixture_file:
+        response_data = json.load(fixture_file)
+
+    with InnertubeCommentClient('https://www.youtube.com/watch?v=dQw4w9WgXcQ') as client:
+        return client._parse_comment_page(response_data)
+
+def test_parses_comment_renderer_page():
+
+    page = parse_fixture('innertube_comment_renderer.json')
+
+    assert page.comment_records == [
+        {'comment_id': 'UgzKq3Ht0bQm3gEAw0B4AaABAg', 'comment_text': 'Still listening in 2023 ❤', 'time_elapsed_since_comment': '1 year ago', 'author': '@melodyfan'},
+        {'comment_id': 'UgyW5mVdT1fN9kD3fZl4AaABAg', 'comment_text': '노래 너무 좋아요', 'time_elapsed_since_comment': '3 months ago (edited)', 'author': '@김민지'}
+    ]
+    assert page.reply_continuation_tokens == ['Eg0SC2R1ZHc0dzlXZ1hjURgGMicaJRIaVWd6S3EzSHQwYlFtM2dFQXcwQjRBYUFCQWciAggAMAA%3D']
+    assert page.next_continuation_token == 'Eg0SC2R1ZHc0dzlXZ1hjUSAAKCgyJ0FETlh4WGVlM2p0aHJxVl9vX1VJd1FfSEJYdlJ0WjBhbQ%3D%3D'
+    assert page.count_of_total_comments == 1482
+    assert page.sort_continuation_tokens == {'top': 'Eg0SC3RvcC1jb21tZW50cxgGMgAiEQ', 'newest': 'Eg0SC25ld2VzdC1maXJzdBgGMgAiEQ'}
+
+def test_parses_comment_view_model_page():
+
+    page = parse_fixture('innertube_comment_view_model.json')
+
+    assert page.comment_records == [
+        {'comment_id': 'Ugx7pQr2zWyL5H_Cf9t1t4AaABAg', 'comment_text': 'The bridge at 2:41 gets me every time', 'time_elapsed_since_comment': '2 years ago', 'author': '@nightdrive'},
+        {'comment_id': 'UgwH1nQ3yX8cR0bVtJJ4AaABAg', 'comment_text': 'Отличная песня', 'time_elapsed_since_comment': '5 days ago (edited)', 'author': '@Отличная_песня'}
+    ]
+    assert page.reply_continuation_tokens == ['Eg0SC2R1ZHc0dzlXZ1hjURgGMicaJRIaVWd4N3BRcjJ6V3lMNUhfQ2Y5dDF0NEFhQUJBZyICCAAwAA%3D%3D']
+    assert page.next_continuation_token == 'Eg0SC2R1ZHc0dzlXZ1hjUSAAKCgyJ0FETlh4WGZCZVhHcnJ0dTZ0VlpNRzRyZk5uRE1qV0k4Zmc%3D'
+    assert page.count_of_total_comments == 2104
+    assert page.sort_continuation_tokens == {'top': 'Eg0SC3RvcC1jb21tZW50cxgGMgAiEQ', 'newest': 'Eg0SC25ld2VzdC1maXJzdBgGMgAiEQ'}
+
+def test_parses_comment_view_model_replies_page():
+
+    page = parse_fixture('innertube_comment_view_model_replies.json')
+
+    assert [r['comment_id'] for r in page.comment_records] == ['Ugx7pQr2zWyL5H_Cf9t1t4AaABAg.9qV2k3RmCxA', 'Ugx7pQr2zWyL5H_Cf9t1t4AaABAg.9qV2k5UP7LB']
+    assert [r['author'] for r in page.comment_records] == ['@roadtrip_tapes', '@nightdrive']
+    assert page.next_continuation_token is None
+    assert page.count_of_total_comments is None
@@ -0,0 +1,64 @@
+from selenium.webdriver.common.keys import Keys
+
+from scrapeYoutubeComment import AdaptivePacer, ScrollPlanner
+
+class ScriptedDriver:
+
+    # Answers every script with the next of the given results, repeating the
+    # last one
+    def __init__(self, *results) -> None:
+
+        self.results = list(results)
+
+    def execute_script(self, script: str, *args):
+
+        return self.results.pop(0) if len(self.results) > 1 else self.results[0]
+
+def test_pacer_keeps_an_estimate_per_key():
+
+    pacer = AdaptivePacer(quiet_period=0.05, poll_frequency=0.01)
+
+    # Page-downs settle at once, a scroll to the end waits on a continuation
+    pacer.wait(ScriptedDriver([1100, 20, False]), [1000, 20, False], 1, Keys.PAGE_DOWN)
+    pacer.wait(ScriptedDriver([1000, 20, True]), [1000, 20, False], 0.2, Keys.END)
+
+    assert pacer.number_of_timeouts == 1
+    assert pacer._get_upper_bound(1, Keys.PAGE_DOWN) == 0.05
+    assert pacer._get_upper_bound(1, Keys.END) > 0.5
+
+def test_pacer_raises_the_estimate_on_a_timeout():
+
+    pacer = AdaptivePacer(quiet_period=0.05, poll_frequency=0.01)
+    pacer.estimated_latencies[Keys.END] = 0.01
+
+    for i in range(3):
+        pacer.wait(ScriptedDriver([1000, 20, True]), [1000, 20, False], 1, Keys.END)
+
+    assert pacer.number_of_timeouts == 3
+    assert pacer._get_upper_bound(1, Keys.END) > 0.05
+
+def test_scroll_planner_waits_for_a_loading_continuation():
+
+    scroll_planner = ScrollPlanner(patience=3, loading_patience=5)
+    scroll_planner.start(ScriptedDriver([1000, 800, 20, True, False]))
+
+    # No progress while the spinner shows does not end the comments
+    for i in range(4):
+        assert scroll_planner.observe(ScriptedDriver([1000, 800, 0, True, True]))
+
+    assert scroll_planner.observe(ScriptedDriver([1800, 800, 20, True, False]))
+
+    for i in range(2):
+        assert scroll_planner.observe(ScriptedDriver([1800, 800, 0, True, False]))
+
+    assert not scroll_planner.observe(ScriptedDriver([1800, 800, 0, True, False]))
+
+def test_scroll_planner_gives_up_on_a_stuck_continuation():
+
+    scroll_planner = ScrollPlanner(patience=3, loading_patience=5)
+    scroll_planner.start(ScriptedDriver([1000, 800, 20, True, False]))
+
+    for i in range(4):
+        assert scroll_planner.observe(ScriptedDriver([1000, 800, 0, True, True]))
+
+    assert not scroll_planner.observe(ScriptedDriver([1000, 800, 0, True, True]))